@@ -3,6 +3,8 @@ import os
 from pathlib import Path
 from typing import Dict
 
+from app_jobs import JobManager, RUNNING, FINISHED, FAILED, CANCELLED
+
 # ========= Helpers ========= #
 # Create starter Excel if missing
 def ensure_excel_present(path: Path):
@@ -18,10 +20,19 @@ def ensure_excel_present(path: Path):
     except Exception:
         pass
 
+# Template bytes, cached until the file's mtime/size changes (one stat per call, no read)
+@st.cache_data(show_spinner=False, max_entries=64)
+def _read_template(path_str: str, mtime_ns: int, size: int) -> bytes:
+    return Path(path_str).read_bytes()
+
 # Return Excel file bytes
 def get_excel_bytes(excel_path: Path) -> bytes:
-    ensure_excel_present(excel_path)
-    return excel_path.read_bytes()
+    try:
+        stat = excel_path.stat()
+    except FileNotFoundError:
+        ensure_excel_present(excel_path)
+        stat = excel_path.stat()
+    return _read_template(str(excel_path), stat.st_mtime_ns, stat.st_size)
 
 # ========= Config ========= #
 st.set_page_config(page_title="BRIXS Reports Downloader", layout="wide")
@@ -53,8 +64,66 @@ ACCENTS = [
     {"c500": "#F97316", "c400": "#FB923C", "glow": "rgba(249,115,22,.35)"},
 ]
 
-if "btn_status" not in st.session_state:
-    st.session_state.btn_status = {label: "" for label in scripts.keys()}
+STATUS_TEXT = {RUNNING: "⏳ Running", FINISHED: "✅ Finished", FAILED: "❌ Failed", CANCELLED: "⛔ Cancelled"}
+
+
+# One job manager for the whole server: every user/tab sees the same running jobs
+@st.cache_resource
+def job_manager() -> JobManager:
+    return JobManager(SCRIPT_DIR, SCRIPT_DIR / "job_logs")
+
+
+jobs = job_manager()
+
+
+def fmt_elapsed(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m {secs:02d}s"
+
+
+def job_status_text(job) -> str:
+    text = STATUS_TEXT[job.status]
+    if job.status == FAILED and job.returncode is not None:
+        text += f" (exit code {job.returncode})"
+    text += f" · {fmt_elapsed(job.elapsed)}"
+    if job.status == RUNNING and job.progress:
+        text += f" · {job.progress}"
+    return text
+
+
+# Live job table + logs; reruns on its own every second without touching the rest of the page
+@st.fragment(run_every=1)
+def jobs_panel():
+    all_jobs = jobs.jobs()
+    st.subheader("🗂️ Jobs")
+    if not all_jobs:
+        st.caption("No jobs yet. Press ▶ Run on a report below.")
+        return
+
+    st.dataframe(
+        [{"#": j.id, "Report": j.label, "Status": job_status_text(j), "Last output": j.last_line}
+         for j in all_jobs],
+        hide_index=True,
+        use_container_width=True,
+    )
+    for job in all_jobs:
+        with st.expander(f"#{job.id} {job.label}", expanded=job.status == RUNNING):
+            if job.status == RUNNING:
+                c1, c2, _ = st.columns([1, 1, 4])
+                if job.waiting_for_enter and c1.button("🔐 Logged in, continue", key=f"enter_{job.id}"):
+                    job.send_enter()
+                if c2.button("⛔ Cancel", key=f"cancel_{job.id}"):
+                    job.cancel()
+            st.code("\n".join(job.tail(200)) or "(no output yet)", language=None)
+            st.caption(f"Full log: {job.log_path}")
+    if st.button("🧹 Clear finished jobs", key="clear_jobs"):
+        jobs.clear_finished()
+
+
+@st.fragment(run_every=2)
+def card_status(label: str):
+    job = jobs.latest(label)
+    st.write(f"**Status:** {job_status_text(job) if job else 'Idle'}")
 
 # ========= Page Header ========= #
 st.markdown(
@@ -67,14 +136,23 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+jobs_panel()
+st.markdown("---")
+
 # ========= Cards Loop ========= #
 for idx, (label, script_path) in enumerate(scripts.items()):
     accent = ACCENTS[idx % len(ACCENTS)]
-    state = st.session_state.btn_status.get(label, "")
 
     # Titles
     st.subheader(label)
 
+    # Only an opened card builds its widgets (template bytes, uploader, buttons)
+    if not st.toggle("Open", key=f"open_{idx}"):
+        job = jobs.latest(label)
+        st.write(f"**Status:** {job_status_text(job) if job else 'Idle'}")
+        st.markdown("---")
+        continue
+
     # 1. Download Excel template
     excel_path = SCRIPT_DIR / excel_files[label]
     excel_bytes = get_excel_bytes(excel_path)
@@ -92,30 +170,30 @@ for idx, (label, script_path) in enumerate(scripts.items()):
         type=["xlsx"],
         key=f"upload_{idx}"
     )
-    if uploaded_file:
+    # save once per upload, not on every rerun while the file sits in the uploader
+    if uploaded_file and st.session_state.get(f"saved_upload_{idx}") != uploaded_file.file_id:
         user_filled_path = SCRIPT_DIR / f"user_{excel_files[label]}"
         with open(user_filled_path, "wb") as f:
-            f.write(uploaded_file.read())
+            f.write(uploaded_file.getbuffer())
+        st.session_state[f"saved_upload_{idx}"] = uploaded_file.file_id
+    if uploaded_file:
         st.success(f"Uploaded {excel_files[label]} successfully!")
 
-    # 3. Run script inside Streamlit with UTF-8 encoding
+    # 3. Run script as a background job (its output streams into the Jobs panel)
     run_button = st.button(
         f"▶ Run {Path(script_path).name}",
         key=f"run_{idx}"
     )
     if run_button:
-        with st.spinner(f"Running {script_path.name}…"):
+        if jobs.running(label):
+            st.warning(f"{script_path.name} is already running; see the Jobs panel above.")
+        else:
             try:
-                # ✅ Force UTF-8 to avoid 'charmap' error
-                with open(script_path, "r", encoding="utf-8") as f:
-                    code = f.read()
-                exec(code, globals())
-                st.success(f"Finished running {script_path.name}")
-                st.session_state.btn_status[label] = "started"
+                job = jobs.start(label, script_path)
+                st.success(f"Started {script_path.name} as job #{job.id}.")
             except Exception as e:
-                st.error(f"❌ Error running {script_path.name}: {e}")
-                st.session_state.btn_status[label] = ""
+                st.error(f"❌ Error starting {script_path.name}: {e}")
 
     # Status line
-    st.write(f"**Status:** {st.session_state.btn_status.get(label, '') or 'Idle'}")
+    card_status(label)
     st.markdown("---")
@@ -0,0 +1,187 @@
+"""
+Background script jobs for the Streamlit app.
+
+Each run is a separate `python -u <script>` subprocess instead of exec() inside the
+Streamlit request: the page stays responsive, several reports can run at once and a
+script can't clobber the app's globals. A reader thread collects stdout (including a
+prompt that has no newline yet, e.g. the "press ENTER" after login) into a rolling
+buffer and a log file in job_logs/. One JobManager is shared by every browser tab.
+"""
+import os
+import sys
+import time
+import signal
+import codecs
+import itertools
+import threading
+import subprocess
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from row_durations import PROGRESS_PREFIX
+
+MAX_LINES = 2000
+
+RUNNING, FINISHED, FAILED, CANCELLED = "running", "finished", "failed", "cancelled"
+
+
+class Job:
+    def __init__(self, job_id: int, label: str, script: Path, cwd: Path, log_dir: Path, args: List[str]):
+        self.id = job_id
+        self.label = label
+        self.script = script
+        self.status = RUNNING
+        self.returncode: Optional[int] = None
+        self.started = time.time()
+        self.ended: Optional[float] = None
+        self._lines = deque(maxlen=MAX_LINES)
+        self._partial = ""
+        self._lock = threading.Lock()
+
+        log_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path = log_dir / f"{time.strftime('%Y%m%d_%H%M%S')}_{job_id}_{script.stem}.log"
+
+        env = dict(os.environ, PYTHONIOENCODING="utf-8", PYTHONUNBUFFERED="1",
+                   # private download folders, so two jobs never watch the same one
+                   YARDI_DOWNLOADS_DIR=str(cwd / "Downloads_workers" / f"job{job_id}"))
+        kwargs = {}
+        if os.name == "nt":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", str(script), *args],
+            cwd=str(cwd), env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            **kwargs,
+        )
+        self._reader = threading.Thread(target=self._read, name=f"job-{job_id}", daemon=True)
+        self._reader.start()
+
+    # ---- output ----
+    def _read(self):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        with open(self.log_path, "w", encoding="utf-8") as log:
+            while True:
+                chunk = os.read(self.proc.stdout.fileno(), 4096)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                log.write(text)
+                log.flush()
+                with self._lock:
+                    parts = (self._partial + text.replace("\r\n", "\n")).split("\n")
+                    self._partial = parts.pop()
+                    self._lines.extend(parts)
+            tail = decoder.decode(b"", final=True)
+            with self._lock:
+                if self._partial or tail:
+                    self._lines.append(self._partial + tail)
+                    self._partial = ""
+        self.returncode = self.proc.wait()
+        self.ended = time.time()
+        if self.status == RUNNING:
+            self.status = FINISHED if self.returncode == 0 else FAILED
+
+    def tail(self, n: int = 200) -> List[str]:
+        with self._lock:
+            lines = list(self._lines)[-n:]
+            if self._partial:
+                lines.append(self._partial)
+        return lines
+
+    @property
+    def last_line(self) -> str:
+        lines = self.tail(1)
+        return lines[-1] if lines else ""
+
+    @property
+    def progress(self) -> str:
+        """The runner's latest "12/80 rows, ETA 14m 20s" line, "" before the first row is done."""
+        with self._lock:
+            for line in reversed(self._lines):
+                if line.startswith(PROGRESS_PREFIX):
+                    return line[len(PROGRESS_PREFIX):].strip()
+        return ""
+
+    @property
+    def waiting_for_enter(self) -> bool:
+        """The script sits at the manual-login input() prompt."""
+        with self._lock:
+            return self.status == RUNNING and "press ENTER" in self._partial
+
+    @property
+    def elapsed(self) -> float:
+        return (self.ended or time.time()) - self.started
+
+    # ---- control ----
+    def send_enter(self):
+        # the prompt line is complete now (a console would echo the newline)
+        with self._lock:
+            if self._partial:
+                self._lines.append(self._partial)
+                self._partial = ""
+        try:
+            self.proc.stdin.write(b"\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def cancel(self):
+        """Stop the script and everything it started (Edge, msedgedriver)."""
+        if self.status != RUNNING:
+            return
+        self.status = CANCELLED
+        try:
+            if os.name == "nt":
+                subprocess.run(["taskkill", "/PID", str(self.proc.pid), "/T", "/F"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                os.killpg(self.proc.pid, signal.SIGTERM)
+        except (ProcessLookupError, OSError):
+            pass
+
+
+def _running(jobs: Iterable[Job], label: str) -> Optional[Job]:
+    return next((j for j in jobs if j.label == label and j.status == RUNNING), None)
+
+
+class JobManager:
+    def __init__(self, cwd: Path, log_dir: Path):
+        self.cwd = cwd
+        self.log_dir = log_dir
+        self._jobs: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self, label: str, script: Path, args: Optional[List[str]] = None) -> Job:
+        """Start `script` unless a job for `label` is already running (then that job is returned)."""
+        with self._lock:
+            running = _running(self._jobs.values(), label)
+            if running:
+                return running
+            job = Job(next(self._ids), label, script, self.cwd, self.log_dir, args or [])
+            self._jobs[job.id] = job
+            return job
+
+    def _snapshot(self) -> List[Job]:
+        """The jobs in start order; Streamlit reruns read them while another session may start one."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def running(self, label: str) -> Optional[Job]:
+        return _running(self._snapshot(), label)
+
+    def latest(self, label: str) -> Optional[Job]:
+        jobs = [j for j in self._snapshot() if j.label == label]
+        return jobs[-1] if jobs else None
+
+    def jobs(self) -> List[Job]:
+        """Newest first."""
+        return sorted(self._snapshot(), key=lambda j: j.id, reverse=True)
+
+    def clear_finished(self):
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.status != RUNNING]:
+                del self._jobs[job_id]
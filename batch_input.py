@@ -0,0 +1,191 @@
+"""
+Batch input for report_runner.py: read a family's job list and validate it in one
+streaming pass, before any browser is launched.
+
+A job list is the family's template workbook or any .xlsx/.csv/.parquet file with the
+same column headers (report_runner.py --input). Rows are streamed (openpyxl read-only,
+csv, pyarrow record batches), so tens of thousands of rows never become a DataFrame
+and the file is read once. A row is rejected up front when a required value is empty,
+or a date doesn't parse; blank rows and repeats of an earlier row (the same report
+again) are skipped.
+"""
+import os
+import csv
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+SUFFIXES = (".xlsx", ".xlsm", ".csv", ".parquet")
+SHOW_REJECTS = 20   # rejected rows printed one by one; the rest are only counted
+
+
+# ====== Streaming readers: (header, iterator of row tuples) ======
+def _iter_xlsx(path: str) -> Tuple[List, Iterator[tuple]]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    rows = wb.active.iter_rows(values_only=True)
+    header = next(rows, ())
+
+    def gen():
+        try:
+            yield from rows
+        finally:
+            wb.close()
+    return list(header), gen()
+
+
+def _iter_csv(path: str) -> Tuple[List, Iterator[tuple]]:
+    f = open(path, "r", newline="", encoding="utf-8-sig")
+    reader = csv.reader(f)
+    header = next(reader, [])
+
+    def gen():
+        try:
+            for row in reader:
+                yield tuple(v if v != "" else None for v in row)
+        finally:
+            f.close()
+    return header, gen()
+
+
+def _iter_parquet(path: str, batch_size: int = 4096) -> Tuple[List, Iterator[tuple]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError(f"{path}: reading .parquet job lists needs pyarrow (pip install pyarrow)")
+    pf = pq.ParquetFile(path)
+    header = list(pf.schema_arrow.names)
+
+    def gen():
+        for batch in pf.iter_batches(batch_size=batch_size):
+            yield from zip(*(col.to_pylist() for col in batch.columns))
+    return header, gen()
+
+
+def read_rows(path: str) -> Tuple[List[str], Iterator[tuple]]:
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in SUFFIXES:
+        raise ValueError(f"{path}: unsupported job list type (use {', '.join(SUFFIXES)})")
+    reader = _iter_parquet if suffix == ".parquet" else _iter_csv if suffix == ".csv" else _iter_xlsx
+    header, rows = reader(path)
+    return [str(h).strip() if h is not None else "" for h in header], rows
+
+
+# ====== Row values → job context ======
+def _is_empty(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    return bool(pd.isna(value))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_text(text: str):
+    # the same few periods repeat on thousands of rows
+    ts = pd.to_datetime(text, errors="coerce")
+    return None if pd.isna(ts) else ts
+
+
+def format_value(value, fmt: Optional[str]) -> Optional[str]:
+    """Template cell → ctx string ("" when empty); None when a date column holds something unparsable."""
+    if _is_empty(value):
+        return ""
+    if fmt:
+        if isinstance(value, (datetime, date)):
+            return value.strftime(fmt)
+        ts = _parse_date_text(str(value).strip())
+        return None if ts is None else ts.strftime(fmt)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def resolve_columns(spec: dict, header: Sequence[str], source: str) -> Dict[str, Optional[int]]:
+    """ctx name -> position of the column actually present (None if absent). Raises if a required one is missing."""
+    positions = {}
+    for n, h in enumerate(header):
+        positions.setdefault(h, n)
+    resolved = {}
+    for name, (cols, _) in spec["columns"].items():
+        candidates = cols if isinstance(cols, list) else [cols]
+        resolved[name] = next((positions[c] for c in candidates if c in positions), None)
+    missing = [spec["columns"][n][0] for n in spec.get("required", []) if resolved.get(n) is None]
+    if missing:
+        raise ValueError(f"{source}: missing required columns {missing}. Got columns: {list(header)}")
+    return resolved
+
+
+def build_ctx(spec: dict, values: tuple, columns: Dict[str, Optional[int]]) -> Tuple[Dict[str, str], Dict[str, object]]:
+    """(ctx, unparsable) for one row; unparsable maps the date columns that didn't parse to their raw value."""
+    ctx, unparsable = {}, {}
+    for name, (_, fmt) in spec["columns"].items():
+        pos = columns.get(name)
+        value = values[pos] if pos is not None and pos < len(values) else None
+        text = format_value(value, fmt)
+        if text is None:
+            unparsable[name] = value
+            text = ""
+        ctx[name] = text
+    variants = spec.get("variants")
+    if variants:
+        ctx.update(variants["values"].get(ctx.get(variants["by"], ""), variants["default"]))
+    for name in list(ctx):
+        ctx[f"{name}_dash"] = ctx[name].replace("/", "-")
+    return ctx, unparsable
+
+
+# ====== One streaming pass ======
+REJECTED, SKIPPED, DUPLICATE = "rejected", "skipped", "duplicate"
+
+
+def load_jobs(family: str, spec: dict, path: Optional[str] = None) -> Tuple[List[tuple], List[dict]]:
+    """
+    Jobs [((family, idx), {"family", "idx", "ctx"})] plus the rows left out up front, as
+    {"idx", "status", "error", "fields"} with status "rejected" (invalid), "skipped" (invalid in a
+    skip-invalid family, not a failure) or "duplicate" (file row = idx + 2).
+    """
+    path = path or spec["template"]
+    header, rows = read_rows(path)
+    columns = resolve_columns(spec, header, path)
+    used = [pos for pos in columns.values() if pos is not None]
+    required = spec.get("required", [])
+    label = spec["template"] if path == spec["template"] else path
+
+    jobs, excluded, seen = [], [], {}
+    counts = {REJECTED: 0, SKIPPED: 0, DUPLICATE: 0}
+    for idx, values in enumerate(rows):
+        if all(_is_empty(values[pos]) for pos in used if pos < len(values)):
+            continue
+        ctx, unparsable = build_ctx(spec, values, columns)
+        problems = [f"unparsable {n} {str(v).strip()!r}" for n, v in unparsable.items()]
+        problems += [f"empty {n}" for n in required if not ctx.get(n) and n not in unparsable]
+        identity = tuple(ctx[name] for name in spec["columns"])
+        if problems:
+            status, error = (SKIPPED if spec.get("skip_invalid") else REJECTED), ", ".join(problems)
+            shown = counts[REJECTED] + counts[SKIPPED]
+            if shown < SHOW_REJECTS:
+                print(f"⚠️ Skipping property {ctx.get('code', '')}: {error}" if status == SKIPPED
+                      else f"❌ {label} row {idx + 2}: {error}")
+        elif identity in seen:
+            status, error = DUPLICATE, f"same report as row {seen[identity] + 2}"
+            if counts[DUPLICATE] < SHOW_REJECTS:
+                print(f"⏭️ {label} row {idx + 2}: {error}, downloaded once")
+        else:
+            seen[identity] = idx
+            jobs.append(((family, idx), {"family": family, "idx": idx, "ctx": ctx}))
+            continue
+        counts[status] += 1
+        excluded.append({"idx": idx, "status": status, "error": error,
+                         "fields": {name: ctx[name] for name in spec["columns"]}})
+
+    invalid = counts[REJECTED] + counts[SKIPPED]
+    if invalid > SHOW_REJECTS:
+        print(f"   ... and {invalid - SHOW_REJECTS} more invalid row(s) in {label}")
+    if excluded:
+        print(f"🔎 {label}: {len(jobs)} valid, {counts[REJECTED]} rejected, {counts[SKIPPED]} skipped, "
+              f"{counts[DUPLICATE]} duplicate(s)")
+    return jobs, excluded
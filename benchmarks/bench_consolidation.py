@@ -0,0 +1,157 @@
+"""
+Consolidation stage benchmark: scan, grouping, target selection, planning, the SQLite
+catalog and pack builds.
+
+    python -m benchmarks.bench_consolidation --singles 600 --numbered 200 --multis 100 --months 4
+    python -m benchmarks.bench_consolidation --save baseline.json
+    python -m benchmarks.bench_consolidation --compare baseline.json --tolerance 0.25
+
+Generates a synthetic All_reports (tens of thousands of correctly named placeholder
+files, see synthetic_reports.make_all_reports), then times each stage of consolidation.py
+and records its peak Python memory (tracemalloc, measured in a second run so it doesn't
+inflate the timing). Only --build packs get real workbooks and are actually built.
+With --compare the exit code is 1 when a stage got slower than baseline x (1 + tolerance).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, Tuple
+
+import consolidation as C
+from report_catalog import CATALOG_NAME
+from benchmarks.synthetic_reports import make_all_reports, fill_sources
+
+
+def measure(fn: Callable, memory: bool = True) -> Tuple[float, int, object]:
+    """(seconds, peak bytes, result) of fn(); peak is 0 when memory=False."""
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def run_stages(folder: str, out_dir: str, build: int, rows: int) -> Dict[str, dict]:
+    stages: Dict[str, dict] = {}
+
+    def stage(name: str, fn: Callable, memory: bool = True, count: int = 0):
+        seconds, peak, result = measure(fn, memory)
+        stages[name] = {"seconds": round(seconds, 4), "peak_mb": round(peak / 2 ** 20, 2), "count": count}
+        return result
+
+    records = stage("scan_folder", lambda: C.scan_folder(folder))
+    stages["scan_folder"]["count"] = len(records)
+    by_code_month, by_code_month_key = stage("group_records", lambda: C.group_records(records), count=len(records))
+    targets = stage("select_targets", lambda: C.select_targets(records), count=len(records))
+    best = C.best_in(by_code_month_key)
+    plans = stage("pack_sources", lambda: [(code, month, C.pack_sources(code, month, best))
+                                           for code, month in targets], count=len(targets))
+
+    # the same planning through the SQLite catalog: first sync parses everything, later ones skip the walk
+    catalog_path = os.path.join(folder, CATALOG_NAME)
+
+    def cold_sync():
+        if os.path.exists(catalog_path):
+            os.remove(catalog_path)
+        C.open_catalog(folder).close()
+
+    stage("catalog_cold_sync", cold_sync, count=len(records))
+    catalog = C.open_catalog(folder)
+    try:
+        stage("catalog_resync", catalog.sync, count=len(records))
+        stage("catalog_full_recheck", lambda: catalog.sync(force=True), count=len(records))
+        cat_targets = stage("catalog_targets", lambda: C.filter_targets(catalog.targets()), count=catalog.count())
+        stage("catalog_pack_sources", lambda: [C.pack_sources(code, month, catalog.best) for code, month in cat_targets],
+              count=len(cat_targets))
+    finally:
+        catalog.close()
+
+    sample = [p for p in plans if p[2]][:build]
+    if sample:
+        for _, _, sources in sample:
+            fill_sources(sources, rows=rows)
+
+        def build_all():
+            for code, month, sources in sample:
+                C.build_pack_openpyxl(sources, os.path.join(out_dir, f"{code.replace('^', '_')}_{month}.xlsx"))
+
+        stage("build_pack_openpyxl", build_all, count=len(sample))
+        stages["build_pack_openpyxl"]["per_pack_s"] = round(stages["build_pack_openpyxl"]["seconds"] / len(sample), 4)
+    return stages
+
+
+def compare(stages: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> list:
+    regressions = []
+    for name, cur in stages.items():
+        base = baseline.get(name)
+        if not base or base["seconds"] <= 0:
+            continue
+        ratio = cur["seconds"] / base["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append((name, base["seconds"], cur["seconds"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the consolidation stages on a synthetic All_reports.")
+    parser.add_argument("--singles", type=int, default=600, help="single property codes (default: %(default)s)")
+    parser.add_argument("--numbered", type=int, default=200, help="numbered property codes (default: %(default)s)")
+    parser.add_argument("--multis", type=int, default=100, help="^ multi property codes (default: %(default)s)")
+    parser.add_argument("--months", type=int, default=4)
+    parser.add_argument("--build", type=int, default=5, help="packs to actually build (default: %(default)s)")
+    parser.add_argument("--rows", type=int, default=200, help="data rows per built source sheet")
+    parser.add_argument("--save", metavar="JSON", help="write the results as a new baseline")
+    parser.add_argument("--compare", metavar="JSON", help="fail if a stage is slower than this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --compare")
+    parser.add_argument("--keep", action="store_true", help="keep the temp folder")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_consolidation_")
+    try:
+        folder, out_dir = os.path.join(tmp, "All_reports"), os.path.join(tmp, "out")
+        os.makedirs(out_dir)
+        started = time.perf_counter()
+        counts = make_all_reports(folder, args.singles, args.numbered, args.multis, args.months)
+        print(f"Generated {sum(counts.values())} files {counts} in {time.perf_counter() - started:.1f}s")
+
+        stages = run_stages(folder, out_dir, args.build, args.rows)
+
+        print(f"\n{'stage':<22} {'items':>8} {'seconds':>9} {'peak MB':>9}")
+        for name, st in stages.items():
+            print(f"{name:<22} {st['count']:>8} {st['seconds']:>9.3f} {st['peak_mb']:>9.1f}")
+
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                json.dump({"params": vars(args), "stages": stages}, f, indent=1)
+            print(f"\nBaseline saved: {args.save}")
+        if args.compare:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)["stages"]
+            regressions = compare(stages, baseline, args.tolerance)
+            if regressions:
+                print(f"\n❌ Slower than {args.compare} (tolerance {args.tolerance:.0%}):")
+                for name, base, cur, ratio in regressions:
+                    print(f"   {name}: {base:.3f}s -> {cur:.3f}s ({ratio:.2f}x)")
+                sys.exit(1)
+            print(f"\n✅ No stage slower than {args.compare} (tolerance {args.tolerance:.0%})")
+    finally:
+        if args.keep:
+            print(f"kept: {tmp}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+End-to-end downloader throughput against the local mock Yardi server.
+
+    python -m benchmarks.bench_downloaders --rows 20 --workers 1 3 --latency 0.3
+    python -m benchmarks.bench_downloaders affordable_report --pipeline 10 --error-rate 0.05
+
+Starts benchmarks.mock_yardi, writes synthetic templates for every family into a
+temp working folder and runs report_runner there headless (no login prompt),
+then prints rows/min per family and worker count. Needs the --browser (Edge by default);
+webdriver-manager fetches a matching driver when edgedriver\\msedgedriver.exe isn't there.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+import report_specs
+from report_specs import SPECS, FAMILY_ORDER
+from benchmarks.mock_yardi import MockYardi
+
+SAMPLE_DATES = {"%m/%Y": datetime(2025, 8, 1), "%m/%d/%Y": datetime(2025, 8, 31)}
+
+
+def write_template(spec: dict, rows: int, folder: str):
+    """A template with `rows` valid rows; report types (if any) are cycled."""
+    variants = list(spec.get("variants", {}).get("values", {}))
+    data = {}
+    for name, (cols, fmt) in spec["columns"].items():
+        col = cols[0] if isinstance(cols, list) else cols
+        if name == "code":
+            data[col] = [f"bm{n:03d}x" for n in range(rows)]
+        elif fmt:
+            data[col] = [SAMPLE_DATES.get(fmt, datetime(2025, 8, 1))] * rows
+        elif variants and name == spec["variants"]["by"]:
+            data[col] = [variants[n % len(variants)] for n in range(rows)]
+        else:
+            data[col] = [""] * rows
+    pd.DataFrame(data).to_excel(os.path.join(folder, spec["template"]), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the downloaders against the mock Yardi server.")
+    parser.add_argument("families", nargs="*", metavar="family", help="default: all")
+    parser.add_argument("--rows", type=int, default=10, help="template rows per family (default: %(default)s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="worker counts to compare")
+    parser.add_argument("--pipeline", type=int, default=0, help="passed to report_runner for shuttle reports")
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--shuttle-delay", type=float, default=2.0)
+    parser.add_argument("--visible", action="store_true", help="show the browser windows")
+    parser.add_argument("--browser", default="edge", help="edge, chrome, chromium or firefox (default: %(default)s)")
+    parser.add_argument("--keep", action="store_true", help="keep the temp working folder")
+    args = parser.parse_args()
+    families = args.families or FAMILY_ORDER
+
+    mock = MockYardi(latency=args.latency, jitter=args.jitter,
+                     error_rate=args.error_rate, shuttle_delay=args.shuttle_delay)
+    url = mock.start()
+    workdir = tempfile.mkdtemp(prefix="bench_downloaders_")
+    cwd = os.getcwd()
+    # yardi_session / report_specs read these (and the working folder) at import time
+    os.environ.update({"YARDI_MENU_URL": url, "YARDI_LOGIN": "none", "YARDI_BROWSER": args.browser,
+                       "YARDI_HEADLESS": "" if args.visible else "1"})
+    # report_specs is already imported (by this module), so point its MENU_URL at the mock too
+    report_specs.MENU_URL = url
+    os.chdir(workdir)
+    sys.argv = sys.argv[:1]
+    try:
+        import report_runner
+
+        for family in families:
+            write_template(SPECS[family], args.rows, workdir)
+
+        table = []
+        for family in families:
+            for workers in args.workers:
+                shutil.rmtree(os.path.join(workdir, "All_reports"), ignore_errors=True)
+                started = time.perf_counter()
+                results = report_runner.run([family], workers=workers, pipeline=args.pipeline)
+                elapsed = time.perf_counter() - started
+                ok = sum(1 for r in results.values() if r["status"] == "ok")
+                table.append((family, workers, len(results), ok, elapsed))
+
+        print(f"\nMock Yardi: latency {args.latency}s (+0..{args.jitter}s), error rate {args.error_rate:.0%}, "
+              f"shuttle delay {args.shuttle_delay}s | requests: {mock.stats}")
+        print(f"{'family':<30} {'workers':>7} {'rows':>5} {'ok':>5} {'seconds':>8} {'rows/min':>9}")
+        for family, workers, rows, ok, elapsed in table:
+            print(f"{family:<30} {workers:>7} {rows:>5} {ok:>5} {elapsed:>8.1f} {ok / elapsed * 60:>9.1f}")
+    finally:
+        os.chdir(cwd)
+        mock.stop()
+        if args.keep:
+            print(f"kept: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Consolidation engine benchmark: openpyxl vs Excel COM.
+
+    python -m benchmarks.bench_engines --packs 20 --rows 300
+
+Builds synthetic packs in a temp folder and times build_pack_openpyxl and, when
+pywin32 + Excel are available, build_pack_com on the same sources.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import consolidation as C
+from benchmarks.synthetic_reports import make_pack_sources
+
+PACK_KEYS = ["BC", "TB", "BS", "IS", "ARR_I", "ARR_E", "AR", "GL"]
+
+
+def build_sources(folder: str, packs: int, rows: int):
+    all_sources = []
+    for n in range(packs):
+        code = f"p{n:03d}x"  # no trailing digits: a "single" property pack
+        make_pack_sources(folder, code, "08-2025", PACK_KEYS, rows=rows)
+    records = C.scan_folder(folder)
+    best = C.best_in(C.group_records(records)[1])
+    for code, month in C.select_targets(records):
+        all_sources.append((code, C.pack_sources(code, month, best)))
+    return all_sources
+
+
+def time_engine(name: str, packs, out_dir: str, build) -> float:
+    started = time.perf_counter()
+    for code, sources in packs:
+        build(sources, os.path.join(out_dir, f"{code}_{name}.xlsx"))
+    elapsed = time.perf_counter() - started
+    print(f"{name:>9}: {elapsed:8.2f}s total | {elapsed / max(1, len(packs)):6.3f}s per pack")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark consolidation engines.")
+    parser.add_argument("--packs", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=200, help="data rows per source sheet")
+    parser.add_argument("--keep", action="store_true", help="keep the temp folder")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_engines_")
+    try:
+        src_dir, out_dir = os.path.join(tmp, "All_reports"), os.path.join(tmp, "out")
+        os.makedirs(out_dir)
+        packs = build_sources(src_dir, args.packs, args.rows)
+        print(f"{len(packs)} packs x {len(PACK_KEYS)} sheets x {args.rows} rows")
+
+        t_py = time_engine("openpyxl", packs, out_dir, C.build_pack_openpyxl)
+
+        try:
+            import win32com.client as win32
+        except ImportError:
+            print("      com: skipped (pywin32 / Excel not available)")
+            return
+        excel = win32.DispatchEx("Excel.Application")
+        excel.Visible = False
+        excel.DisplayAlerts = False
+        try:
+            t_com = time_engine("com", packs, out_dir, lambda s, p: C.build_pack_com(excel, s, p))
+        finally:
+            excel.Quit()
+        print(f"  speedup: {t_com / t_py:.1f}x")
+    finally:
+        if args.keep:
+            print(f"kept: {tmp}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Local stand-in for the Yardi pages the downloaders drive.
+
+    python -m benchmarks.mock_yardi --port 8765 --latency 0.5 --error-rate 0.05
+
+Serves /66553dolphin/pages/menu.aspx with the same menu ids (mi0, mi1, mi1-10,
+sm1-10, ...), a navigation iframe and the "filter" iframe the report forms load
+into. The forms are generated from report_specs.SPECS, so every input, dropdown
+and checkbox has the id the specs use. Behaviour:
+
+  Display_Button   postback after `latency`, re-renders the form with a result grid
+  Excel_Button     answers with an .xlsx attachment (the browser downloads it)
+  btnSubmit_Button queues a shuttle job; TableWriter1_Row<n> gets a View Report link
+                   (SysShuttleDisplayHandler.ashx?FileName=...) after `shuttle_delay`
+  YsiMergeReport_DropDownList posts back on change (the page re-renders)
+
+`error_rate` turns that fraction of Display/Excel/shuttle responses into a server
+error page. Files are only handed to requests carrying the session cookie set by
+the menu page; anything else gets an HTML login page, like an expired session.
+"""
+import io
+import re
+import html
+import time
+import uuid
+import zlib
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs, urlencode
+
+from report_specs import SPECS, PAGES
+from benchmarks.synthetic_reports import write_report
+
+BASE = "/66553dolphin/pages/"
+COOKIE = "ASP.NET_SessionId"
+XLSX_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# menu link -> what it loads: ("filter", page) = report form, ("nav", name) = navigation frame page
+MENU_LINKS = {
+    ("sm1-10", 5): ("filter", "financial"),
+    ("sm1-10", 6): ("filter", "budget_comparison"),
+    ("sm1-10", 8): ("filter", "general_ledger"),
+    ("sm1-2", 2): ("filter", "residential"),
+    ("sm0", 5): ("nav", "affordable"),
+}
+NAV_LINKS = {"_ctl313": "affordable_receivable", "_ctl310": "affordable_rent_roll"}
+POSTBACK_SELECTS = {"YsiMergeReport_DropDownList"}
+CODE_FIELDS = ("PropertyID_LookupCode", "PropLookup_LookupCode", "Ysi4114_LookupCode")
+
+# report key per page for the synthetic workbook (BC gets the Annual/Notes header)
+PAGE_KEYS = {"budget_comparison": "BC"}
+
+PAGE_CSS = """
+body { font-family: sans-serif; font-size: 13px; }
+ul.menu > li { display: inline-block; position: relative; margin-right: 18px; }
+ul.dd, ul.sm { display: none; list-style: none; padding: 4px; border: 1px solid #999; background: #fff; }
+ul.dd.open, ul.sm.open { display: block; }
+iframe { width: 100%; height: 360px; border: 1px solid #ccc; }
+"""
+
+
+def _page(title: str, body: str, script: str = "") -> bytes:
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+            f"<style>{PAGE_CSS}</style></head><body>{body}"
+            f"<script>{script}</script></body></html>").encode("utf-8")
+
+
+def page_fields(page: str) -> List[tuple]:
+    """Every form step the specs run on `page` (plus the menu's own dropdowns), deduplicated by id."""
+    steps = [s for s in PAGES[page] if s[0] == "select"]
+    for spec in SPECS.values():
+        if spec["page"] != page:
+            continue
+        steps.extend(spec["fields"])
+        for output in spec["outputs"]:
+            steps.extend(output.get("fields", []))
+    by_id: Dict[str, dict] = {}
+    for step in steps:
+        if step[0] not in ("text", "select", "checkbox"):
+            continue
+        field = by_id.setdefault(step[1], {"kind": step[0], "options": []})
+        if step[0] == "select":
+            options = [step[2]]
+            if "{" in step[2]:
+                # templated dropdown (report type): offer every variant value
+                options = [v for spec in SPECS.values() if spec["page"] == page
+                           for v in spec.get("variants", {}).get("values", {})]
+            field["options"].extend(o for o in options if o not in field["options"])
+    return list(by_id.items())
+
+
+class MockYardi:
+    """The server plus its knobs; start() returns the menu URL."""
+
+    def __init__(self, port: int = 0, latency: float = 0.3, jitter: float = 0.2,
+                 error_rate: float = 0.0, shuttle_delay: float = 2.0, rows: int = 60):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.shuttle_delay = shuttle_delay
+        self.rows = rows
+        self.shuttles: Dict[str, List[dict]] = {}    # session id -> jobs, newest last
+        self.files: Dict[str, bytes] = {}
+        self.stats = {"display": 0, "excel": 0, "submit": 0, "fetch": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._rnd = random.Random(7)
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def menu_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}{BASE}menu.aspx"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-yardi", daemon=True)
+        self._thread.start()
+        return self.menu_url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # ---- behaviour ----
+    def delay(self):
+        time.sleep(self.latency + self._rnd.uniform(0, self.jitter))
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            failed = self._rnd.random() < self.error_rate
+            if failed:
+                self.stats["errors"] += 1
+            return failed
+
+    def count(self, what: str):
+        with self._lock:
+            self.stats[what] += 1
+
+    def report_bytes(self, page: str, values: Dict[str, str]) -> bytes:
+        code = next((values[k] for k in CODE_FIELDS if values.get(k)), "NA")
+        period = next((v for k, v in values.items() if ("MMYY" in k or "Ysi4118" in k) and v), "")
+        buf = io.BytesIO()
+        write_report(buf, PAGE_KEYS.get(page, "default"), rows=self.rows,
+                     seed=zlib.crc32(f"{page}|{code}|{period}".encode()) & 0xFFFF, period=period)
+        return buf.getvalue()
+
+    # ---- HTML ----
+    def menu_html(self) -> bytes:
+        def submenu(sm_id: str, count: int) -> str:
+            items = []
+            for n in range(1, count + 1):
+                target = MENU_LINKS.get((sm_id, n))
+                if target and target[0] == "filter":
+                    href, frame = f"{BASE}form.aspx?page={target[1]}", "filter"
+                elif target:
+                    href, frame = f"{BASE}nav.aspx?name={target[1]}", "navframe"
+                else:
+                    href, frame = f"{BASE}blank.aspx", "filter"
+                items.append(f"<li><a href='{href}' target='{frame}'>Item {n}</a></li>")
+            return f"<ul class='sm' id='{sm_id}'>{''.join(items)}</ul>"
+
+        body = f"""
+<ul class="menu">
+  <li id="mi0"><a href="#" onclick="open_('sm0'); return false;">Affordable</a>{submenu('sm0', 6)}</li>
+  <li id="mi1"><a href="#" onclick="open_('dd1'); return false;">Reports</a>
+    <ul class="dd" id="dd1">
+      <li id="mi1-2"><a href="#" onmouseover="open_('sm1-2')">Residential</a>{submenu('sm1-2', 3)}</li>
+      <li id="mi1-10"><a href="#" onmouseover="open_('sm1-10')">Financial</a>{submenu('sm1-10', 8)}</li>
+    </ul>
+  </li>
+</ul>
+<iframe id="navframe" name="navframe" src="{BASE}blank.aspx"></iframe>
+<iframe id="filter" name="filter" src="{BASE}blank.aspx"></iframe>
+"""
+        script = """
+function open_(id) { document.getElementById(id).classList.add('open'); }
+"""
+        return _page("Menu", body, script)
+
+    def nav_html(self, name: str) -> bytes:
+        links = "".join(f"<p><a id='{ctl}' href='{BASE}form.aspx?page={page}' target='filter'>{page}</a></p>"
+                        for ctl, page in NAV_LINKS.items())
+        return _page(f"Nav {name}", links)
+
+    def form_html(self, page: str, values: Dict[str, str], session_id: str, grid: bool = False) -> bytes:
+        rows = []
+        for field_id, field in page_fields(page):
+            value = values.get(field_id, "")
+            if field["kind"] == "text":
+                control = f"<input type='text' id='{field_id}' name='{field_id}' value='{html.escape(value)}'>"
+            elif field["kind"] == "checkbox":
+                checked = " checked" if value else ""
+                control = f"<input type='checkbox' id='{field_id}' name='{field_id}' value='on'{checked}>"
+            else:
+                onchange = " onchange='this.form.submit()'" if field_id in POSTBACK_SELECTS else ""
+                options = "".join(
+                    f"<option{' selected' if o == value else ''}>{html.escape(o)}</option>"
+                    for o in [""] + field["options"]
+                )
+                control = f"<select id='{field_id}' name='{field_id}'{onchange}>{options}</select>"
+            rows.append(f"<tr><td><label for='{field_id}'>{field_id}</label></td><td>{control}</td></tr>")
+
+        shuttle = any(s["flow"] == "shuttle" for s in SPECS.values() if s["page"] == page)
+        if shuttle:
+            buttons = "<input type='submit' id='btnSubmit_Button' name='btnSubmit_Button' value='Submit'>"
+        else:
+            buttons = ("<input type='submit' id='Display_Button' name='Display_Button' value='Display'> "
+                       "<input type='submit' id='Excel_Button' name='Excel_Button' value='Excel'>")
+        body = (f"<form method='post' action='{BASE}form.aspx?page={page}'>"
+                f"<table>{''.join(rows)}</table>{buttons}</form>")
+        if grid:
+            cells = "".join(f"<tr><td>{n}</td><td>Account line {n}</td><td>{n * 100:.2f}</td></tr>"
+                            for n in range(1, 21))
+            body += f"<table id='ReportGrid'>{cells}</table>"
+        script = ""
+        if shuttle:
+            body += f"<table id='TableWriter1'>{self.shuttle_rows_html(session_id)}</table>"
+            script = f"""
+setInterval(function () {{
+  fetch('{BASE}shuttle_rows.aspx', {{credentials: 'same-origin'}})
+    .then(function (r) {{ return r.text(); }})
+    .then(function (t) {{ document.getElementById('TableWriter1').innerHTML = t; }});
+}}, 500);
+"""
+        return _page(f"Form {page}", body, script)
+
+    def shuttle_rows_html(self, session_id: str) -> str:
+        with self._lock:
+            jobs = list(reversed(self.shuttles.get(session_id, [])))   # Row0 = newest
+        now = time.time()
+        rows = []
+        for n, job in enumerate(jobs):
+            if job["failed"]:
+                cell = f"{html.escape(job['code'])} - Error"
+            elif now >= job["ready_at"]:
+                cell = (f"<a href='{BASE}SysShuttleDisplayHandler.ashx?{urlencode({'FileName': job['file']})}' "
+                        f"target='_blank'>View Report</a> {html.escape(job['code'])}")
+            else:
+                cell = f"{html.escape(job['code'])} - Processing"
+            rows.append(f"<tr id='TableWriter1_Row{n}'><td>{cell}</td></tr>")
+        return "".join(rows)
+
+    # ---- request handling ----
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def _session_id(self) -> Optional[str]:
+                m = re.search(rf"{re.escape(COOKIE)}=([\w-]+)", self.headers.get("Cookie", ""))
+                return m.group(1) if m else None
+
+            def _send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8",
+                      headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _server_error(self):
+                self._send(500, _page("Server Error", "<h1>Server Error in '/' Application.</h1>"))
+
+            def _file(self, data: bytes, name: str):
+                self._send(200, data, XLSX_TYPE, {"Content-Disposition": f'attachment; filename="{name}"'})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                name = url.path[len(BASE):] if url.path.startswith(BASE) else ""
+                sid = self._session_id()
+
+                if name == "menu.aspx":
+                    headers = {}
+                    if not sid:
+                        headers["Set-Cookie"] = f"{COOKIE}={uuid.uuid4().hex}; Path=/"
+                    self._send(200, mock.menu_html(), headers=headers)
+                elif name == "blank.aspx":
+                    self._send(200, _page("Blank", ""))
+                elif name == "nav.aspx":
+                    self._send(200, mock.nav_html(query.get("name", "")))
+                elif name == "form.aspx" and query.get("page") in PAGES:
+                    mock.delay()
+                    self._send(200, mock.form_html(query["page"], {}, sid))
+                elif name == "shuttle_rows.aspx":
+                    self._send(200, mock.shuttle_rows_html(sid).encode("utf-8"))
+                elif name == "SysShuttleDisplayHandler.ashx":
+                    if not sid:
+                        self._send(200, _page("Login", "<form id='login'>Please log in</form>"))
+                        return
+                    mock.count("fetch")
+                    data = mock.files.get(query.get("FileName", ""))
+                    if data is None or mock.should_fail():
+                        self._server_error()
+                    else:
+                        self._file(data, "Report.xlsx")
+                else:
+                    self._send(404, _page("Not found", "404"))
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8"),
+                                                     keep_blank_values=True).items()}
+                page = query.get("page")
+                sid = self._session_id()
+                if page not in PAGES or not url.path.endswith("form.aspx"):
+                    self._send(404, _page("Not found", "404"))
+                    return
+
+                mock.delay()
+                if "Excel_Button" in form:
+                    mock.count("excel")
+                    if mock.should_fail():
+                        self._server_error()
+                    else:
+                        self._file(mock.report_bytes(page, form), "Report.xlsx")
+                elif "Display_Button" in form:
+                    mock.count("display")
+                    if mock.should_fail():
+                        self._server_error()
+                    else:
+                        self._send(200, mock.form_html(page, form, sid, grid=True))
+                elif "btnSubmit_Button" in form:
+                    mock.count("submit")
+                    file_id = f"{uuid.uuid4().hex}.xlsx"
+                    mock.files[file_id] = mock.report_bytes(page, form)
+                    job = {"code": form.get("Ysi4114_LookupCode", ""), "file": file_id,
+                           "ready_at": time.time() + mock.shuttle_delay, "failed": mock.should_fail()}
+                    with mock._lock:
+                        mock.shuttles.setdefault(sid, []).append(job)
+                    self._send(200, mock.form_html(page, form, sid))
+                else:
+                    # plain postback (auto-postback dropdown)
+                    self._send(200, mock.form_html(page, form, sid))
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local mock of the Yardi report pages.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per postback/download (default: %(default)s)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="extra random latency, 0..N seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of Display/Excel/shuttle errors")
+    parser.add_argument("--shuttle-delay", type=float, default=2.0, help="seconds until a shuttle report is ready")
+    args = parser.parse_args()
+
+    mock = MockYardi(args.port, args.latency, args.jitter, args.error_rate, args.shuttle_delay)
+    url = mock.start()
+    print(f"Mock Yardi on {url}")
+    print(f"  set YARDI_MENU_URL={url} and YARDI_LOGIN=none, then run report_runner.py")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Synthetic Yardi-style exports for benchmarks.
+
+Each workbook looks like a real download: a 3-line merged banner, a bold header
+row, number-formatted data rows and set column widths. Budget Comparison ("BC")
+files carry the 'Annual' / 'Notes' header so the MTD/YTD fix has work to do.
+"""
+import os
+import random
+import zlib
+from typing import Dict, List
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+BANNER = ["Dolphin Property Management", "{title}", "Period = {period}"]
+HEADERS = {
+    "BC": ["Account", "Description", "PTD Actual", "PTD Budget", "Variance", "% Var",
+           "YTD Actual", "YTD Budget", "Variance", "% Var", "Annual", "Notes"],
+    "default": ["Account", "Description", "Beginning", "Debit", "Credit", "Ending"],
+}
+_thin = Side(style="thin", color="FF999999")
+
+
+def write_report(path: str, key: str, rows: int = 200, seed: int = 0, period: str = "08-2025"):
+    rnd = random.Random(seed)
+    headers = HEADERS.get(key, HEADERS["default"])
+    ncols = len(headers)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Report1"
+    for r, text in enumerate(BANNER, start=1):
+        ws.cell(row=r, column=1, value=text.format(title=f"{key} report", period=period))
+        ws.cell(row=r, column=1).font = Font(bold=True, size=12 if r == 1 else 10)
+        ws.cell(row=r, column=1).alignment = Alignment(horizontal="center")
+        ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=ncols)
+
+    header_fill = PatternFill("solid", start_color="FFDDEBF7")
+    for c, h in enumerate(headers, start=1):
+        cell = ws.cell(row=5, column=c, value=h)
+        cell.font = Font(bold=True)
+        cell.fill = header_fill
+        cell.border = Border(bottom=_thin)
+
+    for r in range(6, 6 + rows):
+        ws.cell(row=r, column=1, value=f"{rnd.randint(1000, 9999)}-0000")
+        ws.cell(row=r, column=2, value=f"Account line {r - 5}")
+        for c in range(3, ncols + 1):
+            if headers[c - 1] == "Notes":
+                continue
+            cell = ws.cell(row=r, column=c, value=round(rnd.uniform(-50000, 50000), 2))
+            cell.number_format = "#,##0.00;(#,##0.00)"
+
+    ws.column_dimensions["A"].width = 14
+    ws.column_dimensions["B"].width = 38
+    for c in range(3, ncols + 1):
+        ws.column_dimensions[ws.cell(row=5, column=c).column_letter].width = 15
+    ws.freeze_panes = "A6"
+    wb.save(path)
+
+
+def make_pack_sources(folder: str, code: str, month_year: str, keys: List[str], rows: int = 200) -> List[str]:
+    """Write one report per key as <code>_<MM-YYYY>_<KEY>.xlsx and return their paths."""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i, key in enumerate(keys):
+        path = os.path.join(folder, f"{code}_{month_year}_{key}.xlsx")
+        write_report(path, key, rows=rows, seed=zlib.crc32(f"{code}|{key}|{i}".encode()) & 0xFFFF, period=month_year)
+        paths.append(path)
+    return paths
+
+
+# Reports a month-end run produces per property category (see consolidation.pack_order)
+SINGLE_KEYS = ["BC", "TB", "BS", "IS", "ARR_I", "ARR_E", "AR", "GL"]
+NUMBERED_KEYS = ["BC", "TB", "BS", "IS", "ARR_I", "ARR_E", "PR", "GL", "MS12"]
+MULTI_KEYS = ["BC_PTD", "TB", "BS", "IS", "ARR_I", "ARR_E", "GL"]
+
+
+def make_all_reports(folder: str, singles: int = 600, numbered: int = 200, multis: int = 100,
+                     months: int = 4, subs_per_multi: int = 3, duplicates: float = 0.02,
+                     seed: int = 0) -> Dict[str, int]:
+    """
+    Fill `folder` with correctly named, EMPTY placeholder downloads (names are all scan/plan
+    look at) for single (abc), numbered (abc12) and multi (abc^def^ghi) property codes.
+    Multi codes reuse single codes, whose AR/BC files the multi packs pull per sub-property.
+    `duplicates` adds legacy counter copies (TB1, AR2). Returns file counts per category.
+    """
+    rnd = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    single_codes = [f"s{n:05d}x" for n in range(singles)]
+    numbered_codes = [f"n{n:04d}x{n % 97 + 1}" for n in range(numbered)]
+    multi_codes = ["^".join(rnd.sample(single_codes, subs_per_multi)) for _ in range(multis)] if singles else []
+    month_list = [f"{(m % 12) + 1:02d}-{2025 + m // 12}" for m in range(months)]
+
+    counts = {"single": 0, "numbered": 0, "multi": 0, "duplicate": 0}
+
+    def touch(name: str, category: str):
+        with open(os.path.join(folder, name), "wb"):
+            pass
+        counts[category] += 1
+        if rnd.random() < duplicates:
+            base, ext = os.path.splitext(name)
+            with open(os.path.join(folder, f"{base}1{ext}"), "wb"):
+                pass
+            counts["duplicate"] += 1
+
+    for month in month_list:
+        for code in single_codes:
+            for key in SINGLE_KEYS:
+                touch(f"{code}_{month}_{key}.xlsx", "single")
+        for code in numbered_codes:
+            for key in NUMBERED_KEYS:
+                date = f"{month[:2]}-28-{month[3:]}" if key == "PR" else month
+                touch(f"{code}_{date}_{key}.xlsx", "numbered")
+        for code in multi_codes:
+            for key in MULTI_KEYS:
+                touch(f"{code}_{month}_{key}.xlsx", "multi")
+    return counts
+
+
+def fill_sources(sources, rows: int = 200):
+    """Overwrite the placeholder files of some packs' sources [(key, label, record)] with real workbooks."""
+    for key, _, record in sources:
+        write_report(record["path"], key, rows=rows, seed=zlib.crc32(record["name"].encode()) & 0xFFFF)
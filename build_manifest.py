@@ -0,0 +1,78 @@
+"""
+Build manifest for consolidation.py.
+
+Records, per output pack, the source files it was built from (path, mtime, size,
+sha256). A rerun compares the current sources against it and only rebuilds packs
+whose inputs changed. mtime+size is the fast path; the hash is only computed when
+those differ, so touching a file without changing it doesn't force a rebuild.
+"""
+import os
+import json
+import time
+import hashlib
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = ".consolidation_manifest.json"
+
+
+def sha256_of(path: str, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_manifest(path: str) -> Dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("packs", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(path: str, packs: Dict[str, dict]):
+    """Write atomically so a crash mid-write never leaves a truncated manifest."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "packs": packs}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def fingerprint(path: str, previous: Optional[dict] = None) -> dict:
+    """Current fingerprint of `path`; reuses the previous hash when mtime and size are unchanged."""
+    st = os.stat(path)
+    if previous and previous.get("mtime") == st.st_mtime and previous.get("size") == st.st_size:
+        digest = previous["sha256"]
+    else:
+        digest = sha256_of(path)
+    return {"path": os.path.abspath(path), "mtime": st.st_mtime, "size": st.st_size, "sha256": digest}
+
+
+def source_fingerprints(sources, entry: Optional[dict]) -> List[dict]:
+    """Fingerprints for a pack's sources [(key, label, record)], in sheet order."""
+    previous = {s["path"]: s for s in (entry or {}).get("sources", [])}
+    fps = []
+    for key, label, record in sources:
+        fp = fingerprint(record["path"], previous.get(os.path.abspath(record["path"])))
+        fp.update({"key": key, "label": label})
+        fps.append(fp)
+    return fps
+
+
+def is_up_to_date(entry: Optional[dict], fps: List[dict], out_path: str) -> bool:
+    if not entry or not os.path.exists(out_path):
+        return False
+    old = [(s["key"], s["label"], s["path"], s["sha256"]) for s in entry.get("sources", [])]
+    new = [(s["key"], s["label"], s["path"], s["sha256"]) for s in fps]
+    return old == new
+
+
+def make_entry(code: str, month_year: str, engine: str, fps: List[dict]) -> dict:
+    return {
+        "code": code,
+        "month_year": month_year,
+        "engine": engine,
+        "built_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "sources": fps,
+    }
@@ -1,8 +1,16 @@
+import io
 import os
 import re
+import time
+import contextlib
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple
 
+import telemetry
+from report_catalog import ReportCatalog
+from build_manifest import MANIFEST_NAME, load_manifest, save_manifest, source_fingerprints, is_up_to_date, make_entry
+
 # ====== Folders ======
 ROOT = os.getcwd()
 ALL_REPORTS_DIR = os.path.join(ROOT, "All_reports")
@@ -12,14 +20,24 @@ os.makedirs(OUT_DIR, exist_ok=True)
 # Filter to one month like "08-2025", or None for all
 TARGET_MONTH_YEAR = None
 
+# "openpyxl" (pure Python, any OS) or "com" (Excel via pywin32, Windows only)
+ENGINE = os.environ.get("CONSOLIDATION_ENGINE", "openpyxl")
+
+# Parallel pack builds (openpyxl engine only); 0 = one process per CPU
+WORKERS = int(os.environ.get("CONSOLIDATION_WORKERS", "1"))
+
+# Manifest checkpoints while building (always saved once at the end): after this many
+# built packs or this many seconds, whichever comes first; a crash loses at most that much
+MANIFEST_SAVE_EVERY = 25
+MANIFEST_SAVE_S = 30.0
+
 # ====== Keys & labels ======
 KEYS = [
-    "BC_PTD", "ARR_I", "ARR_E", "MS12", "TB1", "TB", "BS", "IS", "AR", "PR", "GL", "L", "BC"
+    "BC_PTD", "ARR_I", "ARR_E", "MS12", "TB", "BS", "IS", "AR", "PR", "GL", "L", "BC"
 ]
 LABELS = {
     "BC":     "Budget Comparison",
     "BC_PTD": "Budget Comparison (with PTD)",
-    "TB1":    "Trial Balance",
     "TB":     "Trial Balance",
     "BS":     "Balance Sheet",
     "IS":     "Income Statement",
@@ -32,9 +50,9 @@ LABELS = {
     "MS12":   "12 month Statement",
 }
 
-SEQUENCE_SINGLE   = ["BC", "TB1", "TB", "BS", "IS", "ARR_I", "ARR_E", "AR", "GL", "L"]
-SEQUENCE_NUMBERED = ["BC", "TB1", "TB", "BS", "IS", "ARR_I", "ARR_E", "PR", "GL", "MS12", "L"]
-SEQUENCE_MULTI_STATIC_HEAD = ["BC_PTD", "TB1", "TB", "BS", "IS", "ARR_I", "ARR_E"]
+SEQUENCE_SINGLE   = ["BC", "TB", "BS", "IS", "ARR_I", "ARR_E", "AR", "GL", "L"]
+SEQUENCE_NUMBERED = ["BC", "TB", "BS", "IS", "ARR_I", "ARR_E", "PR", "GL", "MS12", "L"]
+SEQUENCE_MULTI_STATIC_HEAD = ["BC_PTD", "TB", "BS", "IS", "ARR_I", "ARR_E"]
 SEQUENCE_MULTI_STATIC_TAIL = ["GL", "L"]
 
 # ====== Filename parsing ======
@@ -50,11 +68,15 @@ def extract_month_year(date_str: str) -> str:
 def month_dot(month_year: str) -> str:
     return month_year.replace("-", ".")
 
+# longest first, so "BC_PTD" wins over "BC"; a trailing counter (TB1, AR2) is an old
+# duplicate download of the same report, not another key
+_KEY_RE = re.compile(r"^(?P<key>" + "|".join(re.escape(k) for k in sorted(KEYS, key=len, reverse=True)) + r")\d*$")
+
 def detect_key_from_suffix(suffix: str) -> str:
     s = suffix.upper()
-    for key in sorted(KEYS, key=len, reverse=True):
-        if s == key or re.fullmatch(key + r"\d+", s):
-            return key
+    m = _KEY_RE.match(s)
+    if m:
+        return m.group("key")
     if s == "ARR":
         return "AR"
     return None
@@ -68,37 +90,43 @@ def is_multi_property(code: str) -> bool:
 def looks_like_our_output(name: str) -> bool:
     return ("_Mgmt Report_" in name) or ("_CONSOLIDATED" in name)
 
+def parse_report_name(name: str):
+    """{"code", "date", "month_year", "key", "suffix"} for a download's file name, or None if it isn't one."""
+    if not name.lower().endswith(".xlsx") or looks_like_our_output(name):
+        return None
+    m = FILENAME_RE.match(os.path.splitext(name)[0])
+    if not m:
+        return None
+    suffix = (m.group("suffix") or "").upper()
+    key    = detect_key_from_suffix(suffix)
+    if key is None:
+        return None
+    date_s = m.group("date")
+    return {"code": m.group("code"), "date": date_s, "month_year": extract_month_year(date_s),
+            "key": key, "suffix": suffix}
+
+# bump when the parsing above changes meaning; the catalog then re-parses every file
+PARSER_VERSION = f"{FILENAME_RE.pattern}|{','.join(KEYS)}"
+
 # ====== Scan All_reports ======
 def scan_folder(folder: str):
+    """Full directory scan (no catalog): one record per download."""
     rows = []
-    for name in os.listdir(folder):
-        if not name.lower().endswith(".xlsx"):
-            continue
-        if looks_like_our_output(name):
-            continue
-        base = os.path.splitext(name)[0]
-        m = FILENAME_RE.match(base)
-        if not m:
-            continue
-        code   = m.group("code")
-        date_s = m.group("date")
-        suffix = (m.group("suffix") or "").upper()
-        key    = detect_key_from_suffix(suffix)
-        if key is None:
-            continue
-        path = os.path.join(folder, name)
-        rows.append({
-            "code": code,
-            "date": date_s,
-            "month_year": extract_month_year(date_s),
-            "key": key,
-            "suffix": suffix,
-            "path": path,
-            "mtime": os.path.getmtime(path),
-            "name": name,
-        })
+    with os.scandir(folder) as it:
+        for entry in it:
+            meta = parse_report_name(entry.name)
+            if meta is None or not entry.is_file():
+                continue
+            meta.update({"path": entry.path, "mtime": entry.stat().st_mtime, "name": entry.name})
+            rows.append(meta)
     return rows
 
+def open_catalog(folder: str = None, rescan: bool = False) -> ReportCatalog:
+    """The All_reports catalog, synced with the folder (only changed names are parsed)."""
+    catalog = ReportCatalog(folder or ALL_REPORTS_DIR, parse_report_name, PARSER_VERSION)
+    catalog.sync(force=rescan)
+    return catalog
+
 # ====== Excel COM helpers (preserve formatting 1:1) ======
 def ensure_unique_sheet_name(xl_wb, base: str) -> str:
     name = base[:31]
@@ -127,14 +155,10 @@ def copy_first_sheet_via_excel(excel, src_path: str, dest_wb, new_name: str):
 def sanitize_filename(name: str) -> str:
     return re.sub(r'[<>:"/\\|?*]', "_", name)
 
-def unique_path(folder: str, filename: str) -> str:
-    base, ext = os.path.splitext(filename)
-    candidate = os.path.join(folder, filename)
-    i = 1
-    while os.path.exists(candidate):
-        candidate = os.path.join(folder, f"{base}({i}){ext}")
-        i += 1
-    return candidate
+def temp_path_for(out_path: str) -> str:
+    """Sibling temp file (still .xlsx for Excel) that is renamed over out_path once complete."""
+    folder, name = os.path.split(out_path)
+    return os.path.join(folder, f"~building {name}")
 
 # --- helpers for header repair ---
 def last_used_col(ws, header_row_guess=5):
@@ -230,23 +254,34 @@ def add_mtd_and_fix_header(ws, excel):
         # never fail consolidation due to a cosmetic header change
         pass
 
-# ====== Main consolidation ======
-def consolidate():
-    records = scan_folder(ALL_REPORTS_DIR)
-    if not records:
-        print(f"No .xlsx files found in {ALL_REPORTS_DIR}")
-        return
-
+# ====== Pack planning ======
+def group_records(records):
+    """(by_code_month, by_code_month_key): records indexed by (code, month) and (code, month, key)."""
     by_code_month = defaultdict(list)
     by_code_month_key = defaultdict(list)
     for r in records:
         by_code_month[(r["code"], r["month_year"])].append(r)
         by_code_month_key[(r["code"], r["month_year"], r["key"])].append(r)
+    return by_code_month, by_code_month_key
+
+def best_in(by_code_month_key):
+    """best(code, month_year, key) over in-memory records (the catalog's best() does the same as a query)."""
+    def best(code, month_year, key):
+        cands = by_code_month_key.get((code, month_year, key), [])
+        return max(cands, key=lambda r: (r["mtime"], r["name"])) if cands else None
+    return best
 
+def category_of(code: str) -> str:
+    return "multi" if is_multi_property(code) else ("numbered" if is_numbered_property(code) else "single")
+
+def select_targets(records) -> List[Tuple[str, str]]:
     targets = sorted(set((r["code"], r["month_year"]) for r in records))
     if TARGET_MONTH_YEAR:
         targets = [t for t in targets if t[1] == TARGET_MONTH_YEAR]
+    return filter_targets(targets)
 
+def filter_targets(targets) -> List[Tuple[str, str]]:
+    """Sorted (code, month) targets minus single properties that are part of a multi that month."""
     # Skip single-property outputs when that code is part of a multi for that month
     multi_subcodes_by_month = defaultdict(set)
     for code, month in targets:
@@ -260,98 +295,306 @@ def consolidate():
             if code in multi_subcodes_by_month[month]:
                 continue
         filtered_targets.append((code, month))
+    return filtered_targets
+
+def pack_order(code: str, category: str):
+    order = []
+    if category == "single":
+        for k in SEQUENCE_SINGLE:
+            order.append((k, code, None))
+    elif category == "numbered":
+        for k in SEQUENCE_NUMBERED:
+            order.append((k, code, None))
+    else:
+        subs = code.split("^")
+        for k in SEQUENCE_MULTI_STATIC_HEAD:
+            order.append((k, code, None))
+        for sub in subs:
+            order.append(("AR", sub, f" ({sub})"))
+        for sub in subs:
+            order.append(("BC", sub, f" ({sub})"))
+        for k in SEQUENCE_MULTI_STATIC_TAIL:
+            order.append((k, code, None))
+    return order
+
+def pack_sources(code: str, month_year: str, best):
+    """
+    [(key, sheet label, newest matching record)] in sheet order; missing reports are left out.
+    best(code, month_year, key) returns the newest record or None (ReportCatalog.best or best_in).
+    """
+    sources = []
+    for key, lookup_code, suffix_note in pack_order(code, category_of(code)):
+        record = best(lookup_code, month_year, key)
+        if record is None:
+            continue
+        sources.append((key, f"{LABELS.get(key, key)}{suffix_note or ''}", record))
+    return sources
+
+def out_path_for(code: str, month_year: str) -> str:
+    out_name = sanitize_filename(f"{code}_Mgmt Report_{month_dot(month_year)}_Sent.xlsx")
+    return os.path.join(OUT_DIR, out_name)
+
+# ====== Pack builders ======
+def build_pack_com(excel, sources, out_path: str) -> list:
+    """Build one pack with Excel; returns the sources actually copied (empty = nothing saved)."""
+    dest_wb = excel.Workbooks.Add()
+    try:
+        initial_sheet_names = [ws.Name for ws in dest_wb.Worksheets]
+        copied = []
+        sheet_index = 1
+
+        for key, label, best in sources:
+            sheet_title = f"{sheet_index:02d} {label}"
+            try:
+                new_ws = copy_first_sheet_via_excel(excel, best["path"], dest_wb, sheet_title)
+                copied.append((key, label, best))
+                sheet_index += 1
+
+                # --- Only for regular Budget Comparison (NOT PTD) ---
+                if key == "BC" and new_ws is not None:
+                    add_mtd_and_fix_header(new_ws, excel)
+
+            except Exception as e:
+                print(f"   ⚠️ Failed to copy {best['name']}: {e}")
+
+        if not copied:
+            return []
+        try:
+            for nm in initial_sheet_names:
+                for ws in list(dest_wb.Worksheets):
+                    if ws.Name == nm:
+                        try: ws.Delete()
+                        except Exception: pass
+        except Exception:
+            pass
 
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        dest_wb.SaveCopyAs(out_path)
+        if not os.path.exists(out_path):
+            raise RuntimeError("SaveCopyAs returned but file not found at expected path.")
+        return copied
+    finally:
+        dest_wb.Close(SaveChanges=False)
+
+def build_pack_openpyxl(sources, out_path: str) -> list:
+    """Build one pack with openpyxl; returns the sources actually copied (empty = nothing saved)."""
+    from openpyxl import Workbook
+    from xlsx_engine import copy_first_sheet
+
+    dest_wb = Workbook()
+    initial_sheets = list(dest_wb.worksheets)
+    copied = []
+    sheet_index = 1
+
+    for key, label, best in sources:
+        sheet_title = f"{sheet_index:02d} {label}"
+        try:
+            # --- MTD/YTD header only for regular Budget Comparison (NOT PTD) ---
+            copy_first_sheet(best["path"], dest_wb, sheet_title, add_mtd=(key == "BC"))
+            copied.append((key, label, best))
+            sheet_index += 1
+        except Exception as e:
+            print(f"   ⚠️ Failed to copy {best['name']}: {e}")
+
+    if not copied:
+        return []
+    for ws in initial_sheets:
+        dest_wb.remove(ws)
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    dest_wb.save(out_path)
+    return copied
+
+def open_excel():
     import win32com.client as win32
     excel = win32.DispatchEx("Excel.Application")
     excel.Visible = False
     excel.DisplayAlerts = False
     excel.DefaultFilePath = OUT_DIR
+    return excel
 
+def build_and_swap(engine: str, excel, sources, out_path: str) -> list:
+    """Build a pack into a temp file and atomically move it over out_path. Returns the copied sources."""
+    out_name = os.path.basename(out_path)
+    tmp_path = temp_path_for(out_path)
     try:
-        for code, month_year in filtered_targets:
-            category = "multi" if is_multi_property(code) else ("numbered" if is_numbered_property(code) else "single")
-            print(f"\n🔧 Consolidating: {code}  |  {month_year}  |  category={category}")
-
-            order = []
-            if category == "single":
-                for k in SEQUENCE_SINGLE:
-                    order.append((k, code, None))
-            elif category == "numbered":
-                for k in SEQUENCE_NUMBERED:
-                    order.append((k, code, None))
-            else:
-                subs = code.split("^")
-                for k in SEQUENCE_MULTI_STATIC_HEAD:
-                    order.append((k, code, None))
-                for sub in subs:
-                    order.append(("AR", sub, f" ({sub})"))
-                for sub in subs:
-                    order.append(("BC", sub, f" ({sub})"))
-                for k in SEQUENCE_MULTI_STATIC_TAIL:
-                    order.append((k, code, None))
-
-            dest_wb = excel.Workbooks.Add()
-            initial_sheet_names = [ws.Name for ws in dest_wb.Worksheets]
-            any_copied = False
-            sheet_index = 1
-
-            for key, lookup_code, suffix_note in order:
-                if key == "PR":
-                    cands = [r for r in by_code_month.get((lookup_code, month_year), []) if r["key"] == "PR"]
-                else:
-                    cands = by_code_month_key.get((lookup_code, month_year, key), [])
-
-                if not cands:
-                    continue
-
-                best = max(cands, key=lambda r: r["mtime"])
-                label = LABELS.get(key, key)
-                sheet_title = f"{sheet_index:02d} {label}{suffix_note or ''}"
+        if engine == "com":
+            copied = build_pack_com(excel, sources, tmp_path)
+        else:
+            copied = build_pack_openpyxl(sources, tmp_path)
+        if copied:
+            # atomic swap: readers see either the old pack or the new one, never half a file
+            os.replace(tmp_path, out_path)
+    except PermissionError:
+        print(f"⛔ Cannot replace '{out_name}'. Please close the file if it's open and run again.")
+        copied = []
+    except Exception as e:
+        print(f"⛔ Save failed: {e}")
+        copied = []
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
-                try:
-                    new_ws = copy_first_sheet_via_excel(excel, best["path"], dest_wb, sheet_title)
-                    any_copied = True
-                    sheet_index += 1
+    if copied:
+        print(f"✅ Saved to: {out_path}")
+    return copied
 
-                    # --- Only for regular Budget Comparison (NOT PTD) ---
-                    if key == "BC" and new_ws is not None:
-                        add_mtd_and_fix_header(new_ws, excel)
+def build_target(task) -> Tuple[List[str], str, float]:
+    """
+    Process-pool entry point (openpyxl engine): build one pack and return (paths of the
+    copied sources, captured console output, build seconds) so the parent can print in order.
+    """
+    sources, out_path = task
+    started = time.perf_counter()
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        copied = build_and_swap("openpyxl", None, sources, out_path)
+    return [os.path.abspath(rec["path"]) for _, _, rec in copied], buf.getvalue(), time.perf_counter() - started
 
-                except Exception as e:
-                    print(f"   ⚠️ Failed to copy {best['name']}: {e}")
+# ====== Main consolidation ======
+def consolidate(engine: str = None, force: bool = False, workers: int = None, rescan: bool = False):
+    """
+    Build every (code, month) pack. The downloads come from the All_reports catalog
+    (see report_catalog.py); `rescan` walks the whole folder even when its mtime is
+    unchanged. Packs whose sources are unchanged since the last build (per the manifest
+    in OUT_DIR) are skipped unless `force` is set. With workers > 1 (openpyxl engine)
+    packs are built in a process pool; output stays in target order. Every pack's build
+    time and outcome is written to run_spans/consolidate_<stamp>.jsonl (see telemetry.py).
+    """
+    engine = (engine or ENGINE).lower()
+    if engine not in ("openpyxl", "com"):
+        raise ValueError(f"Unknown consolidation engine: {engine!r} (use 'openpyxl' or 'com')")
+    workers = WORKERS if workers is None else workers
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if engine == "com" and workers > 1:
+        print("ℹ️ The COM engine drives a single Excel instance; building packs one at a time.")
+        workers = 1
+
+    print(f"⏱️ Pack timings: {telemetry.start('consolidate')}")
+    try:
+        _consolidate(engine, force, workers, rescan)
+    finally:
+        telemetry.stop()
 
-            if any_copied:
-                try:
-                    for nm in initial_sheet_names:
-                        for ws in list(dest_wb.Worksheets):
-                            if ws.Name == nm:
-                                try: ws.Delete()
-                                except Exception: pass
-                except Exception:
-                    pass
-            else:
+
+def _consolidate(engine: str, force: bool, workers: int, rescan: bool):
+    started = time.perf_counter()
+    catalog = open_catalog(rescan=rescan)
+    try:
+        if not catalog.count():
+            print(f"No .xlsx files found in {ALL_REPORTS_DIR}")
+            return
+        filtered_targets = filter_targets(catalog.targets(TARGET_MONTH_YEAR))
+        sources_by_target = {(code, month_year): pack_sources(code, month_year, catalog.best)
+                             for code, month_year in filtered_targets}
+    finally:
+        catalog.close()
+
+    manifest_path = os.path.join(OUT_DIR, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    saved, unchanged, skipped = [], [], []
+
+    # 1) decide what needs building (cheap: manifest + mtimes, hashes only for changed files)
+    plan_started = time.perf_counter()
+    plans = []
+    for code, month_year in filtered_targets:
+        sources = sources_by_target[(code, month_year)]
+        out_path = out_path_for(code, month_year)
+        out_name = os.path.basename(out_path)
+        plan = {"code": code, "month_year": month_year, "sources": sources,
+                "out_path": out_path, "out_name": out_name, "fps": None, "build": False}
+        if sources:
+            entry = manifest.get(out_name)
+            plan["fps"] = source_fingerprints(sources, entry)
+            if force or not is_up_to_date(entry, plan["fps"], out_path):
+                plan["build"] = True
+            elif plan["fps"] != entry["sources"]:
+                # touched but identical files: remember the new mtimes to skip hashing next time
+                entry["sources"] = plan["fps"]
+        plans.append(plan)
+
+    to_build = [p for p in plans if p["build"]]
+    telemetry.record("scan", plan_started - started, targets=len(sources_by_target))
+    telemetry.record("plan", time.perf_counter() - plan_started, packs=len(plans), to_build=len(to_build))
+    if workers > 1 and len(to_build) > 1:
+        print(f"⚙️ Building {len(to_build)} pack(s) with {min(workers, len(to_build))} worker processes...")
+
+    # 2) build, in a pool or inline, and report in target order
+    excel = None
+    pool = None
+    unsaved, last_save = 0, time.perf_counter()
+    try:
+        futures = {}
+        if workers > 1 and len(to_build) > 1:
+            pool = ProcessPoolExecutor(max_workers=min(workers, len(to_build)))
+            for p in to_build:
+                futures[p["out_name"]] = pool.submit(build_target, (p["sources"], p["out_path"]))
+
+        for n, plan in enumerate(plans, start=1):
+            code, month_year, out_name = plan["code"], plan["month_year"], plan["out_name"]
+            print(f"\n🔧 [{n}/{len(plans)}] Consolidating: {code}  |  {month_year}  |  category={category_of(code)}")
+            pack_tags = {"code": code, "month": month_year, "category": category_of(code),
+                         "sources": len(plan["sources"]), "engine": engine}
+
+            if not plan["sources"]:
                 print("   ⚠️ No files found for this code/month. Skipping output.")
-                dest_wb.Close(SaveChanges=False)
+                skipped.append(out_name)
+                telemetry.record("pack_skip", 0.0, "no_sources", **pack_tags)
+                continue
+            if not plan["build"]:
+                print(f"   ⏭️ Up to date, inputs unchanged: {out_name}")
+                unchanged.append(out_name)
+                telemetry.record("pack_skip", 0.0, "unchanged", **pack_tags)
                 continue
 
-            out_name = sanitize_filename(f"{code}_Mgmt Report_{month_dot(month_year)}_Sent.xlsx")
-            out_path = unique_path(OUT_DIR, out_name)
-            os.makedirs(os.path.dirname(out_path), exist_ok=True)
-
-            try:
-                dest_wb.SaveCopyAs(out_path)
-                if os.path.exists(out_path):
-                    print(f"✅ Saved to: {out_path}")
-                else:
-                    print("⛔ SaveCopyAs returned but file not found at expected path.")
-            except Exception as e:
-                print(f"⛔ SaveCopyAs failed: {e}")
+            if out_name in futures:
+                try:
+                    copied_paths, log, seconds = futures[out_name].result()
+                except Exception as e:
+                    copied_paths, log, seconds = [], f"⛔ Worker failed: {e}\n", 0.0
+                print(log, end="")
+            else:
+                if engine == "com" and excel is None:
+                    excel = open_excel()
+                build_started = time.perf_counter()
+                copied = build_and_swap(engine, excel, plan["sources"], plan["out_path"])
+                seconds = time.perf_counter() - build_started
+                copied_paths = [os.path.abspath(rec["path"]) for _, _, rec in copied]
+
+            telemetry.record("pack", seconds, "ok" if copied_paths else "failed", **pack_tags)
+            if not copied_paths:
+                skipped.append(out_name)
+                continue
 
-            dest_wb.Close(SaveChanges=False)
+            saved.append(out_name)
+            manifest[out_name] = make_entry(code, month_year, engine,
+                                            [fp for fp in plan["fps"] if fp["path"] in copied_paths])
+            unsaved += 1
+            if unsaved >= MANIFEST_SAVE_EVERY or time.perf_counter() - last_save >= MANIFEST_SAVE_S:
+                save_manifest(manifest_path, manifest)
+                unsaved, last_save = 0, time.perf_counter()
 
     finally:
-        excel.DisplayAlerts = True
-        excel.Quit()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if excel is not None:
+            excel.DisplayAlerts = True
+            excel.Quit()
+        save_manifest(manifest_path, manifest)
+
+    print(f"\n📦 Consolidation finished: {len(saved)} built, {len(unchanged)} unchanged, {len(skipped)} skipped.")
+    for name in skipped:
+        print(f"   ⚠️ Skipped: {name}")
 
 if __name__ == "__main__":
-    consolidate()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the monthly management report packs.")
+    parser.add_argument("--engine", choices=["openpyxl", "com"], default=None,
+                        help="workbook engine (default: CONSOLIDATION_ENGINE or openpyxl)")
+    parser.add_argument("--force", action="store_true", help="rebuild every pack even if its inputs are unchanged")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="parallel build processes, 0 = one per CPU (default: CONSOLIDATION_WORKERS or 1)")
+    parser.add_argument("--rescan", action="store_true",
+                        help="re-check every file in All_reports instead of only a changed folder")
+    args = parser.parse_args()
+    consolidate(engine=args.engine, force=args.force, workers=args.workers, rescan=args.rescan)
\ No newline at end of file
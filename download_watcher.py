@@ -0,0 +1,110 @@
+import os
+import time
+import queue
+import shutil
+from typing import Optional
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+# Browser temp files that mean "still downloading"
+PARTIAL_EXTS = (".crdownload", ".part", ".tmp")
+
+
+def is_partial(path: str) -> bool:
+    return path.lower().endswith(PARTIAL_EXTS)
+
+
+class _XlsxEventHandler(FileSystemEventHandler):
+    """Pushes (kind, path) for every .xlsx that appears in the watched folder."""
+
+    def __init__(self, events: "queue.Queue"):
+        super().__init__()
+        self.events = events
+
+    def on_moved(self, event):
+        # Edge/Chrome: "<name>.crdownload" is renamed to "<name>.xlsx" once the last byte is written
+        if not event.is_directory and event.dest_path.lower().endswith(".xlsx"):
+            self.events.put(("moved", event.dest_path))
+
+    def on_created(self, event):
+        if not event.is_directory and event.src_path.lower().endswith(".xlsx"):
+            self.events.put(("created", event.src_path))
+
+
+class DownloadWatcher:
+    """
+    Watches one private download folder and reports finished .xlsx files.
+
+    Usage per download:
+        watcher.arm()            # forget anything seen so far
+        excel_btn.click()
+        path = watcher.wait_for_xlsx(timeout=60)
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.events: "queue.Queue" = queue.Queue()
+        self.observer = Observer()
+        self.observer.schedule(_XlsxEventHandler(self.events), folder, recursive=False)
+
+    def start(self):
+        self.observer.start()
+        return self
+
+    def stop(self):
+        try:
+            self.observer.stop()
+            self.observer.join(timeout=5)
+        except Exception:
+            pass
+
+    def clear_folder(self):
+        """The folder is private to one session, so leftovers from a previous run can go."""
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def arm(self):
+        while True:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                return
+
+    def _has_partials(self) -> bool:
+        try:
+            return any(is_partial(n) for n in os.listdir(self.folder))
+        except FileNotFoundError:
+            return False
+
+    def wait_for_xlsx(self, timeout: float = 60) -> Optional[str]:
+        """
+        Block until a finished .xlsx lands in the folder, or return None after `timeout` seconds.
+        A rename from .crdownload is final; a direct create only counts once no partial file is left.
+        """
+        end = time.time() + timeout
+        pending = None
+        while True:
+            remaining = end - time.time()
+            if remaining <= 0:
+                break
+            try:
+                kind, path = self.events.get(timeout=min(remaining, 0.5) if pending else remaining)
+            except queue.Empty:
+                kind, path = None, None
+
+            if kind == "moved" and os.path.exists(path):
+                return path
+            if kind == "created":
+                pending = path
+            if pending and os.path.exists(pending) and os.path.getsize(pending) > 0 and not self._has_partials():
+                return pending
+        return None
@@ -0,0 +1,61 @@
+"""
+What kind of failure a row attempt hit, and how the worker recovers from it.
+
+    ElementTimeout   a form element/postback didn't appear in time  -> re-open the form, retry later
+    StaleFrame       the iframe/element was replaced mid-step       -> re-open the form, retry right away
+    DownloadMissing  the flow ran but no file arrived               -> retry later
+    ServerError      Yardi showed an error page                     -> re-open the form, retry much later
+    SessionExpired   the window is back on the login page           -> log in again, continue the row
+    BrowserGone      the browser/driver died                        -> new browser, continue the row
+
+The last two are about the session, not the row: yardi_session recovers once in place
+and the row carries on without using one of its attempts. The rest go back to the
+queue (job_queue.py) with the backoff below. Anything else keeps its exception class
+name and the normal backoff.
+"""
+from typing import Optional
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    NoSuchFrameException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+ELEMENT_TIMEOUT = "ElementTimeout"
+STALE_FRAME = "StaleFrame"
+DOWNLOAD_MISSING = "DownloadMissing"
+SERVER_ERROR = "ServerError"
+SESSION_EXPIRED = "SessionExpired"
+BROWSER_GONE = "BrowserGone"
+
+SESSION_KINDS = (SESSION_EXPIRED, BROWSER_GONE)   # recovered in place, the row's attempt isn't used
+
+# backoff multiplier for the queue's retry delay (see job_queue.backoff)
+BACKOFF_FACTOR = {STALE_FRAME: 0.0, SERVER_ERROR: 3.0}
+
+SERVER_ERROR_TEXT = (
+    "server error in", "runtime error", "an unexpected error has occurred", "service unavailable",
+    "http error 500", "500 - internal server error", "502 bad gateway", "503 service", "504 gateway",
+)
+BROWSER_GONE_TEXT = (
+    "invalid session id", "no such window", "target window already closed", "session deleted",
+    "disconnected", "not reachable", "failed to establish a new connection", "connection refused",
+)
+
+
+def classify_exception(e: BaseException) -> Optional[str]:
+    """The failure kind an exception alone tells us, None if it needs a look at the page (or is unknown)."""
+    if isinstance(e, (StaleElementReferenceException, NoSuchFrameException)):
+        return STALE_FRAME
+    text = str(e).lower()
+    if any(t in text for t in BROWSER_GONE_TEXT):
+        return BROWSER_GONE
+    if isinstance(e, (TimeoutException, NoSuchElementException)):
+        return ELEMENT_TIMEOUT
+    return None
+
+
+def is_server_error_page(text: str) -> bool:
+    text = text.lower()
+    return any(t in text for t in SERVER_ERROR_TEXT)
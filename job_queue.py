@@ -0,0 +1,222 @@
+"""
+Persistent download job queue (SQLite), shared by the worker sessions of a run.
+
+Every job is a row with a priority, an attempt count and the time it next becomes
+eligible. A worker claims one job (or a run of same-page jobs for the batch path)
+per attempt; a failed attempt goes back into the queue with exponential backoff
+instead of being retried on the spot, so a slow or failing property doesn't hold
+its session while the rest of the batch waits - its retry comes later in the run.
+The database lives in run_journals/ next to the run journals, one run_id per run,
+so the state of a run (attempts, last error) can still be inspected after a crash.
+When a run starts, older runs are pruned except the newest KEEP_RUNS and any run that
+still has pending/running rows (another process may be working on it) and was
+updated within STALE_RUN_S; a crashed run's leftovers go once they are that old.
+"""
+import os
+import json
+import time
+import uuid
+import random
+import sqlite3
+import threading
+from typing import Callable, Hashable, List, Optional, Tuple, Union
+
+QUEUE_PATH = os.path.join(os.getcwd(), "run_journals", "job_queue.sqlite")
+
+ATTEMPTS = 3
+BACKOFF_BASE = 5.0     # seconds before the 2nd attempt; doubles per failed attempt
+BACKOFF_MAX = 120.0
+KEEP_RUNS = 10
+STALE_RUN_S = 2 * 24 * 3600
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id        TEXT NOT NULL,
+    key           TEXT NOT NULL,
+    seq           INTEGER NOT NULL,
+    page          TEXT NOT NULL,
+    payload       TEXT NOT NULL,
+    priority      INTEGER NOT NULL DEFAULT 0,
+    status        TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL,
+    next_eligible REAL NOT NULL,
+    worker        INTEGER,
+    seconds       REAL NOT NULL DEFAULT 0,
+    last_error    TEXT,
+    updated       REAL NOT NULL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (run_id, status, next_eligible);
+"""
+
+
+def backoff(attempts: int) -> float:
+    """Delay before the next attempt after `attempts` failed ones (+/-20% jitter so workers don't retry in step)."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _dump(value) -> str:
+    return json.dumps(value, default=str, sort_keys=True)
+
+
+class JobQueue:
+    """
+    Jobs are (key, job) pairs as passed to yardi_session.run_jobs; keys and pages are
+    stored as JSON, and the job objects themselves are handed back from memory.
+    """
+
+    def __init__(self, jobs: List[Tuple[Hashable, object]], page_of, priority_of=None,
+                 max_attempts: int = ATTEMPTS, path: str = QUEUE_PATH):
+        self.path = path
+        self.run_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        self.max_attempts = max_attempts
+        self._jobs = {_dump(key): (key, job) for key, job in jobs}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # one connection for all worker threads, serialized by self._lock
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        now = time.time()
+        with self.db:
+            # run ids start with their timestamp; keep the newest KEEP_RUNS - 1 besides this one
+            self.db.execute(
+                "DELETE FROM jobs WHERE run_id IN "
+                "(SELECT run_id FROM jobs GROUP BY run_id "
+                " HAVING SUM(status IN (?, ?)) = 0 OR MAX(updated) < ?) "
+                "AND run_id NOT IN (SELECT DISTINCT run_id FROM jobs ORDER BY run_id DESC LIMIT ?)",
+                (PENDING, RUNNING, now - STALE_RUN_S, KEEP_RUNS - 1),
+            )
+            self.db.executemany(
+                "INSERT INTO jobs (run_id, key, seq, page, payload, priority, status, max_attempts, "
+                "next_eligible, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(self.run_id, _dump(key), seq, _dump(page_of(job)), _dump(job),
+                  priority_of(job) if priority_of else 0, PENDING, max_attempts, now, now)
+                 for seq, (key, job) in enumerate(jobs)],
+            )
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+    # ---- claiming ----
+    def claim(self, worker: int, current_page=None,
+              size: Union[int, Callable] = 1) -> List[Tuple[Hashable, object, int]]:
+        """
+        Up to `size` eligible jobs on one page, as (key, job, attempt) with attempt counting from 1;
+        `size` may be a function of the page (e.g. batches only where a batch path exists).
+        Highest priority first; among equals the session's current page (no menu walk),
+        then queue order. [] when nothing is eligible right now (see wait_time()).
+        """
+        now = time.time()
+        with self._lock, self.db:
+            first = self.db.execute(
+                "SELECT page FROM jobs WHERE run_id = ? AND status = ? AND next_eligible <= ? "
+                "ORDER BY priority DESC, page = ? DESC, seq LIMIT 1",
+                (self.run_id, PENDING, now, _dump(current_page)),
+            ).fetchone()
+            if not first:
+                return []
+            if callable(size):
+                size = max(1, size(json.loads(first[0])))
+            rows = self.db.execute(
+                "SELECT key, attempts FROM jobs WHERE run_id = ? AND status = ? AND next_eligible <= ? AND page = ? "
+                "ORDER BY priority DESC, seq LIMIT ?",
+                (self.run_id, PENDING, now, first[0], size),
+            ).fetchall()
+            self.db.executemany(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, updated = ? "
+                "WHERE run_id = ? AND key = ?",
+                [(RUNNING, worker, now, self.run_id, key) for key, _ in rows],
+            )
+        return [(*self._jobs[key], attempts + 1) for key, attempts in rows]
+
+    def wait_time(self) -> Optional[float]:
+        """
+        Seconds until a pending job becomes eligible (0 = one is eligible now), a short
+        poll while only running jobs are left (they may still come back for a retry),
+        or None when the run is finished.
+        """
+        with self._lock:
+            pending = self.db.execute(
+                "SELECT MIN(next_eligible) FROM jobs WHERE run_id = ? AND status = ?", (self.run_id, PENDING),
+            ).fetchone()[0]
+            if pending is not None:
+                return max(0.0, pending - time.time())
+            running = self.db.execute(
+                "SELECT 1 FROM jobs WHERE run_id = ? AND status = ? LIMIT 1", (self.run_id, RUNNING),
+            ).fetchone()
+        return 1.0 if running else None
+
+    # ---- outcomes ----
+    def _key_row(self, key: Hashable) -> tuple:
+        return self.run_id, _dump(key)
+
+    def done(self, key: Hashable, seconds: float):
+        with self._lock, self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = ?, seconds = seconds + ?, last_error = NULL, updated = ? "
+                "WHERE run_id = ? AND key = ?",
+                (DONE, seconds, time.time(), *self._key_row(key)),
+            )
+
+    def retry_or_fail(self, key: Hashable, seconds: float, error: str = "", factor: float = 1.0) -> Optional[float]:
+        """
+        Record a failed attempt. Returns the backoff delay (times `factor`) if the job was
+        requeued, None if it is out of attempts.
+        """
+        with self._lock, self.db:
+            row = self.db.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE run_id = ? AND key = ?", self._key_row(key),
+            ).fetchone()
+            if row is None:
+                return None   # no longer in the database (pruned as stale): nothing to requeue
+            attempts, max_attempts = row
+            now = time.time()
+            if attempts >= max_attempts:
+                self.db.execute(
+                    "UPDATE jobs SET status = ?, seconds = seconds + ?, last_error = ?, updated = ? "
+                    "WHERE run_id = ? AND key = ?",
+                    (FAILED, seconds, error, now, *self._key_row(key)),
+                )
+                return None
+            delay = backoff(attempts) * factor
+            self.db.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, next_eligible = ?, seconds = seconds + ?, "
+                "last_error = ?, updated = ? WHERE run_id = ? AND key = ?",
+                (PENDING, now + delay, seconds, error, now, *self._key_row(key)),
+            )
+            return delay
+
+    def give_back(self, keys: List[Hashable], seconds: float = 0.0):
+        """Requeue claimed jobs without counting the attempt (the session failed, not the rows)."""
+        now = time.time()
+        with self._lock, self.db:
+            self.db.executemany(
+                "UPDATE jobs SET status = ?, worker = NULL, attempts = attempts - 1, next_eligible = ?, "
+                "seconds = seconds + ?, updated = ? WHERE run_id = ? AND key = ?",
+                [(PENDING, now, seconds, now, *self._key_row(key)) for key in keys],
+            )
+
+    def abandon(self):
+        """Fail whatever is still pending/running (every worker died). Returns those keys."""
+        with self._lock, self.db:
+            rows = self.db.execute(
+                "SELECT key FROM jobs WHERE run_id = ? AND status IN (?, ?)", (self.run_id, PENDING, RUNNING),
+            ).fetchall()
+            self.db.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE run_id = ? AND status IN (?, ?)",
+                (FAILED, time.time(), self.run_id, PENDING, RUNNING),
+            )
+        return [self._jobs[key][0] for key, in rows]
+
+    def totals(self, key: Hashable) -> Tuple[int, float]:
+        """(attempts made, seconds spent across them) for a job."""
+        with self._lock:
+            row = self.db.execute("SELECT attempts, seconds FROM jobs WHERE run_id = ? AND key = ?",
+                                  self._key_row(key)).fetchone()
+        return (row[0], round(row[1], 1)) if row else (0, 0.0)
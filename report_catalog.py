@@ -0,0 +1,160 @@
+"""
+SQLite catalog of the downloads in All_reports, for consolidation.py.
+
+Parsed file-name metadata (code, month, report key, mtime) lives in
+All_reports/.catalog/reports.sqlite, indexed by (code, month_year, key). sync() only
+walks the folder when its mtime changed since the last sync (a file was added,
+removed or renamed into place), and then only parses names it hasn't seen or whose
+mtime/size changed. Otherwise it only stats the catalogued files, because a file
+rewritten in place doesn't change the folder's mtime. Target listing and "newest
+file for code/month/key" are queries.
+"""
+import os
+import sqlite3
+from typing import Callable, Dict, List, Optional, Tuple
+
+# In a subfolder: SQLite creates/deletes journal files on every write, which would
+# otherwise change All_reports' own mtime and defeat the "folder unchanged" check
+CATALOG_NAME = os.path.join(".catalog", "reports.sqlite")
+SCHEMA_VERSION = "1"
+
+COLUMNS = ("name", "code", "date", "month_year", "key", "suffix", "mtime", "size")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT);
+CREATE TABLE IF NOT EXISTS reports (
+    name       TEXT PRIMARY KEY,
+    code       TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    month_year TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    suffix     TEXT NOT NULL,
+    mtime      REAL NOT NULL,
+    size       INTEGER NOT NULL
+);
+-- .xlsx files whose names don't parse, remembered so they aren't re-parsed every sync
+CREATE TABLE IF NOT EXISTS ignored (name TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS reports_code_month_key ON reports (code, month_year, key, mtime);
+CREATE INDEX IF NOT EXISTS reports_month ON reports (month_year);
+"""
+
+
+class ReportCatalog:
+    """
+    `parse(name)` turns a file name into {"code", "date", "month_year", "key", "suffix"} or None;
+    `parser_version` changes whenever that parsing changes, which forces a full re-parse.
+    """
+
+    def __init__(self, folder: str, parse: Callable[[str], Optional[dict]], parser_version: str):
+        self.folder = folder
+        self.parse = parse
+        os.makedirs(os.path.dirname(os.path.join(folder, CATALOG_NAME)), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(folder, CATALOG_NAME))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        version = f"{SCHEMA_VERSION}:{parser_version}"
+        if self._meta("version") != version:
+            with self.db:
+                self.db.execute("DELETE FROM reports")
+                self.db.execute("DELETE FROM ignored")
+                self._set_meta("version", version)
+                self._set_meta("dir_mtime", "")
+
+    def close(self):
+        self.db.close()
+
+    def _meta(self, k: str) -> Optional[str]:
+        row = self.db.execute("SELECT v FROM meta WHERE k = ?", (k,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, k: str, v: str):
+        self.db.execute("INSERT OR REPLACE INTO meta (k, v) VALUES (?, ?)", (k, v))
+
+    # ---- incremental sync ----
+    def sync(self, force: bool = False) -> Dict[str, int]:
+        """Bring the catalog up to date with the folder. Returns counts of added/updated/removed rows."""
+        stats = {"added": 0, "updated": 0, "removed": 0, "walked": 0}
+        dir_mtime = repr(os.stat(self.folder).st_mtime)
+        if not force and self._meta("dir_mtime") == dir_mtime:
+            return self._refresh_stats(stats)
+
+        known = {r["name"]: (r["mtime"], r["size"])
+                 for r in self.db.execute("SELECT name, mtime, size FROM reports")}
+        ignored = {r["name"]: (r["mtime"], r["size"])
+                   for r in self.db.execute("SELECT name, mtime, size FROM ignored")}
+        seen = set()
+        upserts: List[tuple] = []
+        new_ignored: List[tuple] = []
+
+        with os.scandir(self.folder) as it:
+            for entry in it:
+                name = entry.name
+                if not name.lower().endswith(".xlsx") or not entry.is_file():
+                    continue
+                stats["walked"] += 1
+                seen.add(name)
+                st = entry.stat()
+                sig = (st.st_mtime, st.st_size)
+                if known.get(name) == sig or ignored.get(name) == sig:
+                    continue
+                meta = self.parse(name)
+                if meta is None:
+                    new_ignored.append((name, st.st_mtime, st.st_size))
+                    continue
+                upserts.append((name, meta["code"], meta["date"], meta["month_year"], meta["key"],
+                                meta["suffix"], st.st_mtime, st.st_size))
+                stats["updated" if name in known else "added"] += 1
+
+        gone = [(n,) for n in known if n not in seen]
+        with self.db:
+            self.db.executemany(f"INSERT OR REPLACE INTO reports ({', '.join(COLUMNS)}) "
+                                f"VALUES ({', '.join('?' * len(COLUMNS))})", upserts)
+            self.db.executemany("INSERT OR REPLACE INTO ignored (name, mtime, size) VALUES (?, ?, ?)", new_ignored)
+            self.db.executemany("DELETE FROM reports WHERE name = ?", gone)
+            self.db.executemany("DELETE FROM ignored WHERE name = ?", [(n,) for n in ignored if n not in seen])
+            self._set_meta("dir_mtime", dir_mtime)
+        stats["removed"] = len(gone)
+        return stats
+
+    def _refresh_stats(self, stats: Dict[str, int]) -> Dict[str, int]:
+        """Same names as last time: only pick up files rewritten in place (new mtime/size) or deleted."""
+        changed, gone = [], []
+        for name, mtime, size in self.db.execute("SELECT name, mtime, size FROM reports").fetchall():
+            try:
+                st = os.stat(os.path.join(self.folder, name))
+            except FileNotFoundError:
+                gone.append((name,))
+                continue
+            if (st.st_mtime, st.st_size) != (mtime, size):
+                changed.append((st.st_mtime, st.st_size, name))
+        with self.db:
+            self.db.executemany("UPDATE reports SET mtime = ?, size = ? WHERE name = ?", changed)
+            self.db.executemany("DELETE FROM reports WHERE name = ?", gone)
+        stats["updated"], stats["removed"] = len(changed), len(gone)
+        return stats
+
+    # ---- queries ----
+    def _record(self, row: sqlite3.Row) -> dict:
+        rec = {k: row[k] for k in COLUMNS}
+        rec["path"] = os.path.join(self.folder, row["name"])
+        return rec
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def targets(self, month_year: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Distinct (code, month_year), sorted; optionally for one month only."""
+        sql = "SELECT DISTINCT code, month_year FROM reports"
+        args: tuple = ()
+        if month_year:
+            sql += " WHERE month_year = ?"
+            args = (month_year,)
+        return [(r[0], r[1]) for r in self.db.execute(sql + " ORDER BY code, month_year", args)]
+
+    def best(self, code: str, month_year: str, key: str) -> Optional[dict]:
+        """The newest file for code/month/key (ties: the later name, e.g. TB1 over TB), or None."""
+        row = self.db.execute(
+            "SELECT * FROM reports WHERE code = ? AND month_year = ? AND key = ? ORDER BY mtime DESC, name DESC LIMIT 1",
+            (code, month_year, key),
+        ).fetchone()
+        return self._record(row) if row else None
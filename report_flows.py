@@ -0,0 +1,597 @@
+"""
+Generic browser steps that execute a report spec (see report_specs.py).
+
+The helpers here used to be copied into every downloader script; now each
+family only describes its menu path, fields and outputs, and these functions
+do the clicking.
+"""
+import io
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from selenium.webdriver import ActionChains
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    ElementNotInteractableException,
+    InvalidElementStateException,
+    TimeoutException,
+    NoSuchElementException,
+)
+
+import waits
+import telemetry
+from report_specs import PAGES
+from report_store import get_store
+from yardi_session import (
+    Session,
+    reports_folder,
+    switch_to_last_iframe,
+    browser_headers,
+    fetch_url,
+)
+
+# Pipelined shuttle mode: parallel HTTP fetches per session
+FETCH_THREADS = 4
+
+# seconds the Display postback may take before the row attempt fails
+DISPLAY_WAIT = 60
+
+
+# ====== Templating ======
+def render(template: str, ctx: Dict[str, str]) -> str:
+    return template.format(**ctx) if "{" in template else template
+
+
+def render_name(template: str, ctx: Dict[str, str]) -> str:
+    """Output file names never contain blanks: an empty value becomes 'NA'."""
+    return template.format(**{k: (v if v else "NA") for k, v in ctx.items()})
+
+
+# ====== Element helpers ======
+def js_set_value(driver, el, value):
+    """Set input value via JS and dispatch events."""
+    driver.execute_script(
+        """
+        const el = arguments[0], val = arguments[1];
+        el.removeAttribute('readonly');
+        el.removeAttribute('disabled');
+        el.value = val;
+        el.dispatchEvent(new Event('input', {bubbles:true}));
+        el.dispatchEvent(new Event('change', {bubbles:true}));
+        """,
+        el, value
+    )
+
+
+def safe_type(session: Session, by, locator, value, click_first=True, use_js_fallback=True, clear_first=True):
+    """
+    Robust setter for inputs: waits visible+enabled, scrolls, tries clear+send_keys, then JS fallback.
+    Returns True if it believes value is set.
+    """
+    driver, wait = session.driver, session.wait
+    try:
+        el = wait.until(EC.presence_of_element_located((by, locator)))
+        wait.until(EC.visibility_of_element_located((by, locator)))
+        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+        if click_first:
+            try:
+                wait.until(EC.element_to_be_clickable((by, locator)))
+                el.click()
+            except Exception:
+                pass
+        if clear_first:
+            try:
+                el.clear()
+            except (InvalidElementStateException, ElementNotInteractableException):
+                driver.execute_script("arguments[0].value='';", el)
+        try:
+            el.send_keys(value)
+            return True
+        except (InvalidElementStateException, ElementNotInteractableException):
+            if use_js_fallback:
+                js_set_value(driver, el, value)
+                return True
+            return False
+    except (TimeoutException, StaleElementReferenceException, NoSuchElementException):
+        return False
+
+
+def ensure_checkbox_checked(session: Session, checkbox_id: str):
+    """Ensure the target checkbox is checked. Safe if it's already checked."""
+    driver, wait = session.driver, session.wait
+    try:
+        cb = wait.until(EC.presence_of_element_located((By.ID, checkbox_id)))
+        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", cb)
+
+        def _is_checked(elem):
+            try:
+                return elem.is_selected() or (str(elem.get_attribute("checked")).lower() in ("true", "checked"))
+            except Exception:
+                return False
+
+        if not _is_checked(cb):
+            # Try normal click
+            try:
+                wait.until(EC.element_to_be_clickable((By.ID, checkbox_id))).click()
+            except Exception:
+                # Fallback: click the label if present, else JS click
+                try:
+                    lbl = driver.find_element(By.XPATH, f"//label[@for='{checkbox_id}']")
+                    driver.execute_script("arguments[0].click();", lbl)
+                except Exception:
+                    driver.execute_script("arguments[0].click();", cb)
+
+    except Exception as e:
+        # If the checkbox isn't present for some report types/screens, just log and continue
+        session.log(f"ℹ️ Checkbox '{checkbox_id}' not found or not clickable now: {e}")
+
+
+def click_button(session: Session, element_id: str):
+    btn = session.wait.until(EC.element_to_be_clickable((By.ID, element_id)))
+    session.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
+    btn.click()
+
+
+# ====== Navigation & form filling ======
+def navigate_page(session: Session, page: str):
+    """
+    Walk the menu path of PAGES[page] from the top-level menu into the report form.
+    Frames are marked before every click/select so an "iframe" step waits for the newly loaded document.
+    """
+    driver, wait = session.driver, session.wait
+    driver.switch_to.default_content()
+    for step in PAGES[page]:
+        kind = step[0]
+        if kind == "click":
+            el = wait.until(EC.element_to_be_clickable((By.XPATH, step[1])))
+            waits.mark_page(session)
+            el.click()
+        elif kind == "hover":
+            ActionChains(driver).move_to_element(
+                wait.until(EC.presence_of_element_located((By.XPATH, step[1])))
+            ).perform()
+        elif kind == "iframe":
+            driver.switch_to.default_content()
+            waits.wait_fresh_iframe(session, step[1], name=f"nav:{page}")
+            iframes = wait.until(EC.presence_of_all_elements_located((By.TAG_NAME, "iframe")))
+            driver.switch_to.frame(iframes[step[1]])
+        elif kind == "select":
+            ddl = wait.until(EC.presence_of_element_located((By.ID, step[1])))
+            waits.mark_page(session)
+            Select(ddl).select_by_visible_text(step[2])
+        elif kind == "pause":
+            time.sleep(step[1])
+        else:
+            raise ValueError(f"Unknown menu step: {step!r}")
+    # main input window (where we enter inputs)
+    session.main_window = driver.current_window_handle
+
+
+# One call sets a whole run of text/select/checkbox steps (everything up to the next
+# postback): the same assignments + events as js_set_value, a select by its visible text
+# (change only fires if the choice differs, like a real click), a checkbox by clicking it.
+# Returns the index of the first step it couldn't do (-1 = all done); the rest then goes
+# through the element-by-element path, which waits for the element.
+FILL_JS = """
+const steps = arguments[0];
+const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+for (let i = 0; i < steps.length; i++) {
+    const [kind, id, value] = steps[i];
+    const el = document.getElementById(id);
+    if (!el) return i;
+    if (kind === 'text') {
+        el.removeAttribute('readonly');
+        el.removeAttribute('disabled');
+        el.value = value;
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    } else if (kind === 'select') {
+        const opt = Array.from(el.options || []).find(o => norm(o.text) === norm(value));
+        if (!opt) return i;
+        if (!opt.selected) {
+            opt.selected = true;
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+    } else if (kind === 'checkbox') {
+        if (!el.checked) el.click();
+    } else {
+        return i;
+    }
+}
+return -1;
+"""
+
+# YARDI_BATCH_FILL=0 goes back to filling field by field (send_keys, Select)
+BATCH_FILL = os.environ.get("YARDI_BATCH_FILL", "1") != "0"
+
+
+def fill_step(session: Session, step, ctx: Dict[str, str]):
+    """One form step, element by element (waits for the element, types like a user)."""
+    kind = step[0]
+    if kind == "checkbox":
+        ensure_checkbox_checked(session, step[1])
+    elif kind == "text":
+        value = render(step[2], ctx)
+        if value and not safe_type(session, By.ID, step[1], value):
+            raise RuntimeError(f"Could not set {step[1]}")
+    elif kind == "select":
+        value = render(step[2], ctx)
+        if not value:
+            return
+        try:
+            ddl = session.wait.until(EC.presence_of_element_located((By.ID, step[1])))
+            Select(ddl).select_by_visible_text(value)
+        except Exception:
+            raise RuntimeError(f"Could not select {step[1]} = {value!r}")
+    else:
+        raise ValueError(f"Unknown field step: {step!r}")
+
+
+def fill_batch(session: Session, steps, ctx: Dict[str, str]):
+    """A run of text/select/checkbox steps in one script call; whatever it can't do falls back to fill_step."""
+    todo = []
+    for step in steps:
+        if step[0] not in ("text", "select", "checkbox"):
+            raise ValueError(f"Unknown field step: {step!r}")
+        value = render(step[2], ctx) if step[0] != "checkbox" else ""
+        if step[0] == "checkbox" or value:   # empty text/select steps are skipped
+            todo.append((step, [step[0], step[1], value]))
+    if not todo:
+        return
+    failed_at = 0
+    if BATCH_FILL:
+        started = time.perf_counter()
+        failed_at = session.driver.execute_script(FILL_JS, [args for _, args in todo])
+        waits.record("form_fill", time.perf_counter() - started)
+        if failed_at < 0:
+            return
+        session.log(f"ℹ️ Quick fill stopped at {todo[failed_at][0][1]}; filling the rest field by field")
+    for step, _ in todo[failed_at:]:
+        fill_step(session, step, ctx)
+
+
+def fill_fields(session: Session, fields, ctx: Dict[str, str]):
+    """
+    Run form steps. Consecutive text/select/checkbox steps are set in one script call
+    (fill_batch). A ("postback",) step waits until the page finished the postback the
+    previous step triggered; the page is marked before the run holding that step. A
+    postback with no field steps before it (first step, or right after another postback
+    or a pause) has nothing new to wait for and is skipped.
+    """
+    run: List[tuple] = []
+    for step in fields:
+        if step[0] not in ("postback", "pause"):
+            run.append(step)
+            continue
+        if step[0] == "postback":
+            if not run:
+                continue
+            waits.mark_page(session)
+            fill_batch(session, run, ctx)
+            waits.wait_postback(session, name=f"postback:{run[-1][1]}")
+        else:
+            fill_batch(session, run, ctx)
+            time.sleep(step[1])
+        run = []
+    fill_batch(session, run, ctx)
+
+
+# ====== Saving ======
+SAVE_MESSAGES = {
+    "new": "✅ Saved as: {name}",
+    "updated": "🔄 Changed since last download, replaced: {name}",
+    "unchanged": "♻️ Identical to the stored copy, kept: {name}",
+}
+
+
+def save_download(session: Session, downloaded: str, spec: dict, name: str) -> str:
+    """Hand a finished download to the All_reports store (identical re-downloads are dropped)."""
+    dest_path, outcome = get_store(reports_folder).put(downloaded, name)
+    session.log(SAVE_MESSAGES[outcome].format(name=os.path.basename(dest_path)))
+    return dest_path
+
+
+def save_bytes(session: Session, data: bytes, name: str) -> str:
+    dest_path, outcome = get_store(reports_folder).put_bytes(data, name)
+    session.log(SAVE_MESSAGES[outcome].format(name=os.path.basename(dest_path)))
+    return dest_path
+
+
+# ====== Flow: Display → Excel ======
+def run_display_excel(session: Session, spec: dict, ctx: Dict[str, str]) -> Optional[List[str]]:
+    """
+    One attempt for one row: fill the form, then for every output click Display and Excel
+    and wait for the file. Returns the saved paths, or None if any download is missing.
+    """
+    switch_to_last_iframe(session.driver)
+    with telemetry.span("fill"):
+        fill_fields(session, spec["fields"], ctx)
+
+    saved = []
+    for n, output in enumerate(spec["outputs"], start=1):
+        with telemetry.tags(output=n):
+            if output.get("fields"):
+                with telemetry.span("fill"):
+                    fill_fields(session, output["fields"], ctx)
+
+            with telemetry.span("display"):
+                waits.mark_page(session)
+                click_button(session, "Display_Button")
+                session.log("📊 Display clicked")
+                # report rendered = postback finished and the Excel button is usable again
+                waits.wait_postback(session, name="display", timeout=DISPLAY_WAIT)
+            with telemetry.span("excel_export"):
+                excel = waits.timed_wait(session, "excel_enabled", EC.element_to_be_clickable((By.ID, "Excel_Button")))
+                session.downloads.arm()
+                session.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", excel)
+                excel.click()
+                session.log("⬇️ Download initiated...")
+
+            with telemetry.span("download_wait") as sp:
+                downloaded = session.downloads.wait_for_xlsx(timeout=spec.get("download_timeout", 30))
+                if not downloaded:
+                    sp["outcome"] = "missing"
+            if not downloaded:
+                session.log(f"❌ Download not detected ({render_name(output['name'], ctx)}).")
+                return None
+            with telemetry.span("save"):
+                saved.append(save_download(session, downloaded, spec, render_name(output["name"], ctx)))
+    return saved
+
+
+# ====== Flow: Submit → shuttle link ======
+SHUTTLE_LINKS_JS = """
+return Array.from(document.querySelectorAll('[id^="TableWriter1_Row"]')).map(tr => {
+    const a = tr.querySelector('td a');
+    return [tr.id, a ? (a.href || '') : '', tr.innerText || ''];
+});
+"""
+
+
+def submit_shuttle(session: Session, spec: dict, ctx: Dict[str, str]):
+    """Fill the form for one row and press Submit (the report is built server-side)."""
+    switch_to_last_iframe(session.driver)
+    with telemetry.span("fill"):
+        fill_fields(session, spec["fields"], ctx)
+    with telemetry.span("submit"):
+        session.wait.until(EC.element_to_be_clickable((By.XPATH, '//*[@id="btnSubmit_Button"]'))).click()
+
+
+# wait until the View Report link is truly ready (visible, enabled, and with a real href)
+def wait_view_report_ready(session: Session, max_wait=45):
+    xpath = '//*[@id="TableWriter1_Row0"]/td/a'
+    end = time.time() + max_wait
+    while time.time() < end:
+        try:
+            el = session.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
+            if el.is_displayed() and el.is_enabled():
+                href = el.get_attribute("href") or ""
+                # the popup URL shows SysShuttleDisplayHandler.ashx?FileName=...
+                if "SysShuttleDisplayHandler" in href or "FileName=" in href or href.startswith("http"):
+                    return el
+        except (TimeoutException, StaleElementReferenceException):
+            pass
+        time.sleep(0.3)
+    raise TimeoutException("View Report link not ready in time.")
+
+
+def run_shuttle(session: Session, spec: dict, ctx: Dict[str, str]) -> Optional[str]:
+    """One attempt for one row: Submit, wait for View Report, let the popup download the file."""
+    driver = session.driver
+    main_window = session.main_window
+    try:
+        submit_shuttle(session, spec, ctx)
+        session.log("⏳ Waiting for report to process...")
+
+        with telemetry.span("shuttle_wait"):
+            view_button = wait_view_report_ready(session, max_wait=spec.get("shuttle_wait", 45))
+
+        # Forget earlier downloads BEFORE clicking
+        session.downloads.arm()
+
+        handles_before = driver.window_handles
+        view_button.click()
+        session.log("📅 View Report clicked.")
+
+        # Optional: detect popup and switch so Edge initiates the download there
+        popup_handle = None
+        try:
+            WebDriverWait(driver, 5).until(EC.new_window_is_opened(handles_before))
+            popup_candidates = [h for h in driver.window_handles if h not in handles_before]
+            if popup_candidates:
+                popup_handle = popup_candidates[0]
+        except Exception:
+            popup_handle = None
+        if popup_handle:
+            try:
+                driver.switch_to.window(popup_handle)
+            except Exception:
+                popup_handle = None
+
+        # Wait for the popup's download to finish (.crdownload → .xlsx)
+        with telemetry.span("download_wait") as sp:
+            downloaded = session.downloads.wait_for_xlsx(timeout=spec.get("download_timeout", 12))
+            if not downloaded:
+                sp["outcome"] = "missing"
+
+        # Close popups and return to main
+        for h in list(driver.window_handles):
+            if h != main_window:
+                try:
+                    driver.switch_to.window(h)
+                    driver.close()
+                except Exception:
+                    pass
+        driver.switch_to.window(main_window)
+
+    except Exception:
+        try:
+            driver.switch_to.window(main_window)
+            switch_to_last_iframe(driver)
+            session.log("↩️ Attempting to return to main window after failure...")
+        except Exception:
+            pass
+        raise
+
+    if not downloaded:
+        session.log("⚠️ No new .xlsx detected after View Report.")
+        return None
+    with telemetry.span("save"):
+        return save_download(session, downloaded, spec, render_name(spec["outputs"][0]["name"], ctx))
+
+
+def read_shuttle_links(session: Session):
+    """
+    Ready View Report links in the shuttle table as [(href, row_text)], oldest first.
+    (Row0 is the newest job, so the highest row number is the oldest.)
+    """
+    rows = session.driver.execute_script(SHUTTLE_LINKS_JS) or []
+    ready = []
+    for row_id, href, text in rows:
+        if "SysShuttleDisplayHandler" in href or "FileName=" in href:
+            try:
+                row_no = int(row_id.replace("TableWriter1_Row", ""))
+            except ValueError:
+                row_no = 0
+            ready.append((row_no, href, text))
+    return [(href, text) for _, href, text in sorted(ready, key=lambda r: r[0], reverse=True)]
+
+
+def match_job(text: str, pending: List[dict]) -> Optional[dict]:
+    """
+    The submitted job a finished shuttle report belongs to: the only pending job whose property
+    code appears in `text` as a whole token ("abc" doesn't match "abc^def"). None when no job or
+    more than one does; the report is then never guessed from submit order.
+    """
+    hits = [j for j in pending
+            if j["code"] and re.search(rf"(?<![\w^]){re.escape(j['code'])}(?![\w^])", text or "", re.IGNORECASE)]
+    return hits[0] if len(hits) == 1 else None
+
+
+def workbook_header_text(data: bytes, rows: int = 12) -> str:
+    """Text of the first rows of an .xlsx's first sheet (the report header names the property)."""
+    from openpyxl import load_workbook
+
+    try:
+        wb = load_workbook(io.BytesIO(data), read_only=True)
+    except Exception:
+        return ""
+    try:
+        ws = wb.worksheets[0]
+        return " ".join(str(v) for row in ws.iter_rows(max_row=rows, values_only=True) for v in row if v is not None)
+    finally:
+        wb.close()
+
+
+def run_shuttle_batch(session: Session, spec: dict, batch) -> Dict[object, str]:
+    """
+    Pipelined mode: submit every (key, ctx) of the batch first, then collect the finished
+    files as their links appear, fetching them over HTTP with the browser's cookies
+    (no popups). Returns {key: saved path}; missing keys fall back to run_shuttle.
+    """
+    started = time.time()
+    driver = session.driver
+    switch_to_last_iframe(driver)
+    seen = {href for href, _ in read_shuttle_links(session)}
+    max_wait = spec.get("shuttle_wait", 45)
+
+    pending = []
+    for key, ctx in batch:
+        try:
+            with telemetry.tags(code=ctx.get("code", "")):
+                submit_shuttle(session, spec, ctx)
+            pending.append({"key": key, "code": ctx.get("code", ""), "ctx": ctx, "deadline": time.time() + max_wait})
+            session.log(f"📨 Submitted: {render(spec['describe'], ctx)}")
+        except Exception as e:
+            # left out of `pending`, so the pool retries it on the one-by-one path
+            session.log(f"⚠️ Submit failed for {render(spec['describe'], ctx)}: {e}")
+
+    outputs = {}
+    finished = []   # jobs identified from their workbook header, already saved
+    headers = None
+    fetches = {}
+    with ThreadPoolExecutor(max_workers=FETCH_THREADS) as pool:
+        while pending and time.time() < max(j["deadline"] for j in pending):
+            switch_to_last_iframe(driver)
+            for href, text in read_shuttle_links(session):
+                if href in seen or not pending:
+                    continue
+                seen.add(href)
+                headers = headers or browser_headers(session)
+                job = match_job(f"{href} {text}", pending)
+                if job is None:
+                    # the link doesn't say whose report it is: ask the workbook's header
+                    job = _match_by_header(session, href, headers, pending, spec)
+                    if job is not None:
+                        finished.append(job)
+                    continue
+                pending.remove(job)
+                telemetry.record("shuttle_wait", time.time() - job["deadline"] + max_wait, code=job["code"])
+                fetches[pool.submit(_timed_fetch, href, headers, job["code"])] = job
+                session.log(f"📅 Report ready: ({job['code']}) → fetching")
+            if pending:
+                time.sleep(0.5)
+
+        for fut in as_completed(fetches):
+            job = fetches[fut]
+            try:
+                data = fut.result()
+                if not data.startswith(b"PK"):
+                    raise RuntimeError("response is not an .xlsx file")
+            except Exception as e:
+                session.log(f"⚠️ Fetch failed for ({job['code']}): {e}")
+                continue
+            with telemetry.span("save", code=job["code"]):
+                outputs[job["key"]] = save_bytes(session, data, render_name(spec["outputs"][0]["name"], job["ctx"]))
+
+    for job in finished:
+        outputs[job["key"]] = job["output"]
+    # the batch's share per row, under the same "row" step as the one-by-one path (row_durations learns from it)
+    per_row = (time.time() - started) / len(batch)
+    for key, ctx in batch:
+        if key in outputs:
+            telemetry.record("row", per_row, code=ctx.get("code", ""))
+    for job in pending:
+        session.log(f"⚠️ No View Report link matched ({job['code']}); it goes back to the queue.")
+        telemetry.record("shuttle_wait", max_wait, "missing", code=job["code"])
+    return outputs
+
+
+def _match_by_header(session: Session, href: str, headers: Dict[str, str], pending: List[dict],
+                     spec: dict) -> Optional[dict]:
+    """
+    Fetch a report whose link names no (single) pending property and match it by the property
+    in its header; the job is removed from `pending` and gets its "output". None if that doesn't
+    settle it either: the file is dropped and the unmatched jobs go back to the queue.
+    """
+    try:
+        data = fetch_url(href, headers)
+    except Exception as e:
+        session.log(f"⚠️ Fetch failed for an unlabelled report: {e}")
+        return None
+    job = match_job(workbook_header_text(data), pending) if data.startswith(b"PK") else None
+    if job is None:
+        session.log("⚠️ A finished report matches no single submitted property; not saved")
+        return None
+    pending.remove(job)
+    session.log(f"📅 Report ready: ({job['code']}) → matched by its header")
+    job["output"] = save_bytes(session, data, render_name(spec["outputs"][0]["name"], job["ctx"]))
+    return job
+
+
+def _timed_fetch(href: str, headers: Dict[str, str], code: str) -> bytes:
+    # runs in a fetch thread, which doesn't see the worker's telemetry tags
+    with telemetry.span("fetch", code=code):
+        return fetch_url(href, headers)
+
+
+FLOWS = {
+    "display_excel": run_display_excel,
+    "shuttle": run_shuttle,
+}
@@ -0,0 +1,229 @@
+"""
+One runner for every report family in report_specs.py.
+
+    python report_runner.py                                  # all families with rows in their template
+    python report_runner.py gl_analytics residential --workers 3
+    python report_runner.py affordable_report --pipeline 10
+    python report_runner.py financial_analytics --resume     # continue the latest run, skipping rows already done
+    python report_runner.py residential --input jobs.csv     # a .xlsx/.csv/.parquet job list instead of the template
+    python report_runner.py --browser chromium --headless    # e.g. on a Linux server (drivers via webdriver-manager)
+
+Validates every job list in one streaming pass first (batch_input.py), then logs in
+once per browser session (or reuses a saved login, see session_slots.py), orders the
+jobs by menu page so each session walks the menu once per page. Every run is
+journaled row by row in run_journals/ (see run_journal.py) and ends with a per-row
+results file in run_results/ (see run_results.py).
+Failed rows are retried later in the run with backoff (see job_queue.py).
+Per-step timings go to run_spans/ (`python telemetry.py --by report`, see telemetry.py);
+past row timings put the longest rows first and give the ETA (see row_durations.py).
+"""
+import os
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+import waits
+import telemetry
+from batch_input import load_jobs
+from run_journal import RunJournal, new_journal_path, latest_journal_path, load_journal, completed_ids, as_output_list
+from report_specs import SPECS, PAGES, FAMILY_ORDER
+from report_flows import FLOWS, navigate_page, render, run_shuttle_batch
+from row_durations import DurationModel, Eta
+from run_results import PROBLEM_STATUSES, make_record, new_results_path, write_results, print_results_summary
+import yardi_session
+from yardi_session import WORKERS, BROWSERS, run_jobs
+
+
+# ====== Template rows → jobs ======
+def load_family(family: str, path: Optional[str] = None) -> Tuple[List[tuple], List[dict]]:
+    """Jobs plus the rows left out up front from the family's template (or `path`), see batch_input.load_jobs."""
+    return load_jobs(family, SPECS[family], path)
+
+
+def journal_entry(job: dict) -> dict:
+    """Journal identity of a job: family plus its template values (code, report type, period...)."""
+    spec = SPECS[job["family"]]
+    fields = {name: job["ctx"][name] for name in spec["columns"]}
+    job_id = "|".join([job["family"]] + [f"{k}={v}" for k, v in fields.items()])
+    return {"id": job_id, "family": job["family"], "row": job["idx"] + 2, "fields": fields}
+
+
+# ====== Callbacks for yardi_session.run_jobs ======
+def page_of(job: dict) -> str:
+    return SPECS[job["family"]]["page"]
+
+
+def describe(job: dict) -> str:
+    return render(SPECS[job["family"]]["describe"], job["ctx"])
+
+
+def span_tags(job: dict) -> dict:
+    """Telemetry attributes of a job's spans; "report" is the report type, or the family if it has none."""
+    ctx = job["ctx"]
+    return {"family": job["family"], "report": ctx.get("report_type") or job["family"], "code": ctx.get("code", "")}
+
+
+def process_row(session, job: dict):
+    spec = SPECS[job["family"]]
+    with telemetry.tags(**span_tags(job)), telemetry.span("row") as sp:
+        output = FLOWS[spec["flow"]](session, spec, job["ctx"])
+        if not output:
+            sp["outcome"] = "no_output"
+        return output
+
+
+def make_process_batch(pipeline: int):
+    def process_batch(session, batch):
+        spec = SPECS[batch[0][1]["family"]]
+        if spec["flow"] != "shuttle":
+            return None
+        tags = span_tags(batch[0][1])
+        with telemetry.tags(family=tags["family"], report=tags["report"]), telemetry.span("batch", rows=len(batch)):
+            return run_shuttle_batch(session, spec, [(key, job["ctx"]) for key, job in batch])
+    return process_batch if pipeline > 1 else None
+
+
+def make_batch_size(pipeline: int):
+    """Rows a session claims at once on a page: `pipeline` where the shuttle batch path applies, else 1."""
+    shuttle_pages = {spec["page"] for spec in SPECS.values() if spec["flow"] == "shuttle"}
+    return lambda page: max(1, pipeline) if page in shuttle_pages else 1
+
+
+# ====== Main ======
+def run(families: List[str], workers: int = 1, pipeline: int = 0,
+        resume: Optional[str] = None, inputs: Optional[Dict[str, str]] = None) -> Dict[tuple, dict]:
+    """
+    Run the families' rows; with `resume` (a journal path) rows already done in that journal are skipped.
+    `inputs` maps a family to a job list (.xlsx/.csv/.parquet) used instead of its template.
+    Every job list is validated before the first browser starts.
+    """
+    inputs = inputs or {}
+    all_jobs, excluded = [], []
+    for family in families:
+        source = inputs.get(family, SPECS[family]["template"])
+        jobs, left_out = load_family(family, source)
+        excluded += [make_record(family, x["idx"] + 2, x["status"], error=x["error"], fields=x["fields"],
+                                 error_class="InvalidRow" if x["status"] == "rejected" else None)
+                     for x in left_out]
+        print(f"📋 {SPECS[family]['title']}: {len(jobs)} row(s) from {source}")
+        all_jobs.extend(jobs)
+
+    entries = {key: journal_entry(job) for key, job in all_jobs}
+    already_done = []
+    if resume:
+        state = load_journal(resume)
+        done = completed_ids(state)
+        before = len(all_jobs)
+        already_done = [make_record(e["family"], e["row"], "already_done", id=e["id"], fields=e["fields"],
+                                    outputs=state[e["id"]]["outputs"])
+                        for e in entries.values() if e["id"] in done]
+        all_jobs = [(key, job) for key, job in all_jobs if entries[key]["id"] not in done]
+        print(f"⏭️ Resuming {os.path.basename(resume)}: {before - len(all_jobs)} row(s) already done, "
+              f"{len(all_jobs)} to go")
+
+    # group by menu page (stable: template order is kept inside a page)
+    page_rank = {page: n for n, page in enumerate(PAGES)}
+    all_jobs.sort(key=lambda kj: page_rank[page_of(kj[1])])
+
+    results = {}
+    if all_jobs:
+        journal = RunJournal(resume or new_journal_path())
+        print(f"📝 Journal: {journal.path}")
+        journal.pending(entries[key] for key, _ in all_jobs)
+
+        # longest rows first, so no worker is left with a big one at the end
+        model = DurationModel.from_history()
+        expected = {}
+        for key, job in all_jobs:
+            tags = span_tags(job)
+            expected[key] = model.expected(tags["report"], tags["code"])
+        groups = {key: (page_of(job), DurationModel.priority(expected[key])) for key, job in all_jobs}
+        eta = Eta(expected, max(1, min(workers, len(all_jobs))), groups, model.navigate_s)
+        print(f"📈 Row durations learned from {model.rows_seen} past row(s)" if model.rows_seen
+              else "📈 No row timings from past runs yet; every row is expected to take as long")
+        print(eta.plan_text())
+        print(f"⏱️ Step timings: {telemetry.start('download')}")
+
+        def on_result(key, result):
+            if result["status"] == "ok":
+                journal.done(entries[key], as_output_list(result["output"]), result["seconds"])
+            else:
+                journal.failed(entries[key], result["seconds"])
+            print(eta.done(key, result["seconds"]))
+
+        try:
+            results = run_jobs(
+                all_jobs, navigate_page, process_row, describe, page_of=page_of,
+                workers=workers, process_batch=make_process_batch(pipeline), batch_size=make_batch_size(pipeline),
+                on_result=on_result,
+                priority_of=lambda job: DurationModel.priority(expected[(job["family"], job["idx"])]),
+            )
+        finally:
+            journal.close()
+            telemetry.stop()
+        waits.print_summary()
+    else:
+        print("Nothing to download.")
+
+    records = excluded + already_done + [
+        make_record(entries[key]["family"], entries[key]["row"], r["status"], id=entries[key]["id"],
+                    error_class=r.get("error_class"), error=r.get("error"), attempts=r.get("attempts", 0),
+                    seconds=r["seconds"], worker=r["worker"], outputs=as_output_list(r["output"]),
+                    fields=entries[key]["fields"])
+        for key, r in results.items()
+    ]
+    if records:
+        path = new_results_path()
+        write_results(path, records)
+        print_results_summary(records, path)
+        if any(r["status"] in PROBLEM_STATUSES for r in records):
+            print(f"   Failed rows as a workbook: python run_results.py {path} --xlsx failures.xlsx")
+    return results
+
+
+def main(families: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Download Yardi reports for one or more report families.")
+    if families is None:
+        parser.add_argument("families", nargs="*", metavar="family",
+                            help=f"report families to run (default: all): {', '.join(FAMILY_ORDER)}")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="number of parallel browser sessions (default: %(default)s)")
+    parser.add_argument("--pipeline", type=int, default=0, metavar="N",
+                        help="shuttle reports: submit N properties per session before collecting (0 = one at a time)")
+    parser.add_argument("--browser", choices=BROWSERS, default=None,
+                        help="browser to drive (default: YARDI_BROWSER or edge)")
+    parser.add_argument("--headless", action="store_true", help="run the browsers without windows (YARDI_HEADLESS=1)")
+    parser.add_argument("--input", metavar="FILE",
+                        help="job list (.xlsx/.csv/.parquet) to use instead of the template; needs exactly one family")
+    parser.add_argument("--resume", nargs="?", const="latest", default=None, metavar="JOURNAL",
+                        help="skip rows already done in a run journal (default: the latest one of these families)")
+    args = parser.parse_args()
+
+    if families is None:
+        unknown = [f for f in args.families if f not in SPECS]
+        if unknown:
+            parser.error(f"unknown report family: {', '.join(unknown)} (choose from {', '.join(FAMILY_ORDER)})")
+        families = args.families or FAMILY_ORDER
+    if args.browser:
+        yardi_session.BROWSER = args.browser
+    if args.headless:
+        yardi_session.HEADLESS = True
+    inputs = {}
+    if args.input:
+        if len(families) != 1:
+            parser.error("--input needs exactly one report family")
+        if not os.path.exists(args.input):
+            parser.error(f"--input: file not found: {args.input}")
+        inputs[families[0]] = args.input
+    resume = args.resume
+    if resume == "latest":
+        resume = latest_journal_path(families)
+        if not resume:
+            parser.error(f"--resume: no run journal of {', '.join(families)} found in run_journals/")
+    elif resume and not os.path.exists(resume):
+        parser.error(f"--resume: journal not found: {resume}")
+    run(families, workers=max(1, args.workers), pipeline=args.pipeline, resume=resume, inputs=inputs)
+    print("Report downloads finished. You can exit this command window.")
+
+
+if __name__ == "__main__":
+    main()
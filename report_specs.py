@@ -0,0 +1,247 @@
+"""
+Declarative specs for every Yardi report family the downloaders handle.
+
+PAGES   menu path to a report form: a list of steps run from the top-level menu
+        ("click"/"hover" an XPath, "iframe" index to enter, "select" id+text, "pause" seconds).
+        An "iframe" step waits for the frame to hold a newly loaded document, so no pauses are needed.
+SPECS   one entry per family (= one template workbook):
+  title         family name in the runner's log ("📋 <title>: N row(s) from ...")
+  template      input workbook, one job per row
+  page          key into PAGES
+  columns       ctx name -> (template column(s), strftime format or None); a list of columns
+                means "first one present". Every value is also exposed as <name>_dash ("/" -> "-").
+  required      ctx names that must be non-empty, else the row is rejected before the browser starts
+  skip_invalid  invalid rows count as "skipped" in the run results, not as "rejected" failures
+  variants      extra ctx picked by the value of another ctx field (e.g. the report type)
+  fields        form steps: ("text", id, template) | ("select", id, text) | ("checkbox", id) |
+                ("postback",) = wait until the previous step's postback finished | ("pause", s);
+                text/select steps whose value renders empty are skipped; the steps between two
+                postbacks are set in one script call (report_flows.fill_batch)
+  describe      one-line row description for the log, rendered from ctx like the fields
+  flow          "display_excel" (Display, then Excel download) or "shuttle" (Submit, then View Report link)
+  download_timeout  seconds to wait for each output's file once its download started (default 30, shuttle 12)
+  shuttle_wait  shuttle flow: seconds the report may take to reach the View Report link (default 45)
+  outputs       one download per entry: optional extra "fields", then saved as "name"
+                (saved through report_store: a re-download replaces the file only if its content changed)
+"""
+
+import os
+
+# YARDI_MENU_URL points the downloaders at another host (e.g. benchmarks/mock_yardi.py)
+MENU_URL = os.environ.get("YARDI_MENU_URL", "https://www.yardiasp14.com/66553dolphin/pages/menu.aspx")
+
+PAGES = {
+    "financial": [
+        ("click", '//*[@id="mi1"]/a'),
+        ("hover", '//*[@id="mi1-10"]/a'),
+        ("click", '//*[@id="sm1-10"]/li[5]/a'),
+        ("iframe", -1),
+    ],
+    "budget_comparison": [
+        ("click", '//*[@id="mi1"]/a'),
+        ("hover", '//*[@id="mi1-10"]/a'),
+        ("click", '//*[@id="sm1-10"]/li[6]/a'),
+        ("iframe", -1),
+    ],
+    "general_ledger": [
+        ("click", '//*[@id="mi1"]/a'),
+        ("hover", '//*[@id="mi1-10"]/a'),
+        ("click", '//*[@id="sm1-10"]/li[8]/a'),
+        ("iframe", -1),
+    ],
+    "residential": [
+        ("click", '//*[@id="mi1"]/a'),
+        ("hover", '//*[@id="mi1-2"]/a'),
+        ("click", '//*[@id="sm1-2"]/li[2]/a'),
+        ("iframe", -1),
+    ],
+    "affordable_receivable": [
+        ("click", '//*[@id="mi0"]/a'),
+        ("hover", '//*[@id="mi0"]'),
+        ("click", '//*[@id="sm0"]/li[5]/a'),
+        ("iframe", 0),
+        ("click", '//*[@id="_ctl313"]'),
+        ("iframe", -1),
+    ],
+    "affordable_rent_roll": [
+        ("click", '//*[@id="mi0"]/a'),
+        ("hover", '//*[@id="mi0"]'),
+        ("click", '//*[@id="sm0"]/li[5]/a'),
+        ("iframe", 0),
+        ("click", '//*[@id="_ctl310"]'),
+        ("iframe", -1),
+        ("select", "YsiMergeReport_DropDownList", "Affordable Rent Roll with Lease Charges (AffRntRollLsChgs)"),
+        ("iframe", -1),
+    ],
+}
+
+SPECS = {
+    "financial_analytics": {
+        "title": "Trial/Balance/Income/12Month Statement/Budget Comparison(with PTD)",
+        "template": "financial_analytics.xlsx",
+        "page": "financial",
+        "columns": {
+            "code": ("Codes", None),
+            "report_type": ("Report_type", None),
+            "from": ("From_period", "%m/%Y"),
+            "to": ("To_period", "%m/%Y"),
+        },
+        "required": ["code", "report_type"],
+        "variants": {
+            "by": "report_type",
+            "values": {
+                "Trial Balance":                {"tree": "ysi_tb", "suffix": "TB"},
+                "Balance Sheet":                {"tree": "ysi_bs", "suffix": "BS", "from": ""},
+                "Income Statement":             {"tree": "ysi_is", "suffix": "IS"},
+                "Budget Comparison (with PTD)": {"tree": "ysi_is", "suffix": "BC_PTD"},
+                "12 Month Statement":           {"tree": "ysi_is", "suffix": "MS12"},
+            },
+            "default": {"tree": "", "suffix": "REP"},
+        },
+        "describe": "{code} | Report: {report_type} | Period: {from} → {to}",
+        "fields": [
+            # "Suppress Zero" must be checked BEFORE filling inputs, and again after the
+            # report type re-renders the form
+            ("checkbox", "SupressZero_CheckBox"),
+            ("text", "PropertyID_LookupCode", "{code}"),
+            ("select", "ReportNum_DropDownList", "{report_type}"),
+            ("checkbox", "SupressZero_CheckBox"),
+            ("text", "BookID_LookupCode", "Accrual"),
+            ("text", "TreeID_LookupCode", "{tree}"),
+            ("text", "FromMMYY_TextBox", "{from}"),
+            ("text", "ToMMYY_TextBox", "{to}"),
+        ],
+        "flow": "display_excel",
+        "download_timeout": 60,
+        "outputs": [{"name": "{code}_{to_dash}_{suffix}.xlsx"}],
+    },
+    "Budget_comparison": {
+        "title": "Budget Comparison",
+        "template": "Budget_comparison.xlsx",
+        "page": "budget_comparison",
+        "columns": {
+            "code": ("Codes", None),
+            "from": ("From_period", "%m/%Y"),
+            "to": ("To_period", "%m/%Y"),
+        },
+        "required": ["code", "from", "to"],
+        "describe": "Property: '{code}' | Period: {from} to {to}",
+        "fields": [
+            ("text", "PropertyID_LookupCode", "{code}"),
+            ("text", "FromMMYY_TextBox", "{from}"),
+            ("text", "ToMMYY_TextBox", "{to}"),
+            ("select", "ReportNum_DropDownList", "Budget Comparison"),
+            ("text", "BookID_LookupCode", "Accrual"),
+            ("text", "TreeID_LookupCode", "2025_camber_op"),
+        ],
+        "flow": "display_excel",
+        "download_timeout": 30,
+        "outputs": [{"name": "{code}_{from_dash}_BC.xlsx"}],
+    },
+    "gl_analytics": {
+        "title": "General Ledger",
+        "template": "gl_analytics.xlsx",
+        "page": "general_ledger",
+        "columns": {
+            "code": ("Codes", None),
+            "from": ("From_period", "%m/%Y"),
+            "to": ("To_period", "%m/%Y"),
+        },
+        "required": ["code", "from", "to"],
+        "describe": "Property: '{code}' | Period: {from} to {to}",
+        "fields": [
+            ("text", "PropertyID_LookupCode", "{code}"),
+            ("text", "FromMMYY_TextBox", "{from}"),
+            ("text", "ToMMYY_TextBox", "{to}"),
+            ("text", "BookID_LookupCode", "Accrual"),
+        ],
+        "flow": "display_excel",
+        "download_timeout": 30,
+        "outputs": [{"name": "{code}_{from_dash}_GL.xlsx"}],
+    },
+    "residential": {
+        "title": "Property Residential (Rent Roll with Lease Charges)",
+        "template": "residential.xlsx",
+        "page": "residential",
+        "columns": {
+            "code": ("Codes", None),
+            "date": ("Date", "%m/%d/%Y"),
+            "month": ("Month", "%m/%Y"),
+        },
+        "required": ["code", "date", "month"],
+        "describe": "Property: '{code}' | Period: {date} to {month}",
+        "fields": [
+            ("text", "PropLookup_LookupCode", "{code}"),
+            ("text", "Date2_TextBox", "{date}"),
+            ("text", "MMYY2_TextBox", "{month}"),
+            ("select", "ReportType_DropDownList", "Rent Roll with Lease Charges"),
+            ("select", "SummarizeBy_DropDownList", "Unit"),
+        ],
+        "flow": "display_excel",
+        "download_timeout": 30,
+        "outputs": [{"name": "{code}_{date_dash}_PR.xlsx"}],
+    },
+    "affordable_receivable_report": {
+        "title": "Affordable Receivable Report (Include/Exclude)",
+        "template": "affordable_receivable_report.xlsx",
+        "page": "affordable_receivable",
+        "columns": {
+            "code": ("Codes", None),
+            "period": (["Month", "From_period", "From", "Period", "MMYY", "As_of_Month"], "%m/%Y"),
+        },
+        "required": ["code", "period"],
+        "skip_invalid": True,
+        "describe": "Property: '{code}' | Period: '{period}'",
+        "fields": [
+            ("text", "PropLookup_LookupCode", "{code}"),
+            ("select", "ReportType_DropDownList", "Receivable Aging Summary"),
+            ("select", "SummarizeBy_DropDownList", "Resident"),
+            ("text", "MMYY2_TextBox", "{period}"),
+        ],
+        "flow": "display_excel",
+        "download_timeout": 30,
+        "outputs": [
+            {"fields": [("select", "cmbHUDSubsidies_DropDownList", "Include"), ("postback",)],
+             "name": "{code}_{period_dash}_ARR_I.xlsx"},
+            {"fields": [("select", "cmbHUDSubsidies_DropDownList", "Exclude"), ("postback",)],
+             "name": "{code}_{period_dash}_ARR_E.xlsx"},
+        ],
+    },
+    "affordable_report": {
+        "title": "Affordable Rent Roll with Lease Charges",
+        "template": "affordable_report.xlsx",
+        "page": "affordable_rent_roll",
+        "columns": {
+            "code": ("Codes", None),
+            "date": ("Date", "%m/%d/%Y"),
+            "month": ("Month", "%m/%Y"),
+        },
+        "required": ["code", "date", "month"],
+        "describe": "({code})",
+        "fields": [
+            ("text", "Ysi4114_LookupCode", "{code}"),
+            ("postback",),
+            ("text", "Ysi4117_TextBox", "{date}"),
+            ("text", "Ysi4118_TextBox", "{month}"),
+            ("select", "YsiMergeReport_DropDownList", "Affordable Rent Roll with Lease Charges (AffRntRollLsChgs)"),
+            ("postback",),
+            ("select", "Ysi4122_DropDownList", "Unit"),
+            ("select", "YsiOutpuType_DropDownList", "Excel"),
+            ("postback",),
+        ],
+        "flow": "shuttle",
+        "shuttle_wait": 45,
+        "download_timeout": 12,
+        "outputs": [{"name": "{code}_{month_dash}_AR.xlsx"}],
+    },
+}
+
+# Month-end order when running everything in one session
+FAMILY_ORDER = [
+    "financial_analytics",
+    "Budget_comparison",
+    "gl_analytics",
+    "residential",
+    "affordable_receivable_report",
+    "affordable_report",
+]
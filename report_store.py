@@ -0,0 +1,157 @@
+"""
+Content-addressed store behind All_reports.
+
+Every saved report is fingerprinted by its normalized cell content (not its bytes:
+Yardi stamps each export with the time it was generated). The index keeps
+name -> fingerprint in All_reports/.store/index.json, so saving a download is a
+dict lookup instead of an os.path.exists loop:
+
+    same name, same content   -> the new download is dropped, the existing file is kept
+    same name, other content  -> the new download replaces the old file
+    new name                  -> moved into All_reports
+
+Re-downloads therefore never pile up as TB1, TB2, AR(1), ... copies.
+"""
+import os
+import re
+import json
+import shutil
+import hashlib
+import datetime
+import threading
+from typing import Dict, Optional, Tuple
+
+from openpyxl import load_workbook
+
+INDEX_VERSION = 1
+
+# clock times in report banners ("Generated 10/17/2025 3:41 PM") change on every export
+_TIME_OF_DAY = re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:[AaPp]\.?[Mm]\.?)?")
+
+
+def _normalize(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat() if value.time() == datetime.time() else "<datetime>"
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    text = _TIME_OF_DAY.sub("", str(value))
+    return " ".join(text.split())
+
+
+def content_digest(path: str) -> str:
+    """sha256 over every sheet's normalized cell values; raw bytes if the file can't be parsed."""
+    h = hashlib.sha256()
+    try:
+        wb = load_workbook(path, read_only=True, data_only=True)
+    except Exception:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        return "raw:" + h.hexdigest()
+    try:
+        for ws in wb.worksheets:
+            h.update(f"\x00sheet\x00{ws.title}\n".encode("utf-8"))
+            for row in ws.iter_rows(values_only=True):
+                cells = [_normalize(v) for v in row]
+                while cells and not cells[-1]:
+                    cells.pop()
+                if cells:
+                    h.update(("\x1f".join(cells) + "\n").encode("utf-8"))
+    finally:
+        wb.close()
+    return h.hexdigest()
+
+
+class ReportStore:
+    """Thread-safe; one instance per folder (see get_store)."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.store_dir = os.path.join(folder, ".store")
+        self.index_path = os.path.join(self.store_dir, "index.json")
+        self._lock = threading.Lock()
+        self._files: Dict[str, dict] = {}          # name -> {"digest", "size", "mtime"}
+        self._load()
+
+    # ---- index ----
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self._files = data.get("files", {})
+        except (FileNotFoundError, ValueError):
+            self._files = {}
+
+    def _save(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp = f"{self.index_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": self._files}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+    def _set(self, name: str, digest: str):
+        st = os.stat(os.path.join(self.folder, name))
+        self._files[name] = {"digest": digest, "size": st.st_size, "mtime": st.st_mtime}
+
+    def digest_of(self, name: str) -> Optional[str]:
+        """Fingerprint of All_reports/<name>; re-computed only if the file changed on disk since indexing."""
+        path = os.path.join(self.folder, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._files.pop(name, None)
+            return None
+        entry = self._files.get(name)
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+            return entry["digest"]
+        digest = content_digest(path)
+        self._set(name, digest)
+        return digest
+
+    # ---- saving ----
+    def put(self, src_path: str, name: str) -> Tuple[str, str]:
+        """
+        Move a finished download into the folder as `name`.
+        Returns (path, outcome) with outcome "new", "updated" or "unchanged".
+        """
+        digest = content_digest(src_path)
+        dest = os.path.join(self.folder, name)
+        with self._lock:
+            existing = self.digest_of(name)
+            if existing == digest:
+                os.remove(src_path)
+                outcome = "unchanged"
+            else:
+                # stage next to the index (same volume, invisible to consolidation's scan), then swap in
+                os.makedirs(self.store_dir, exist_ok=True)
+                tmp = os.path.join(self.store_dir, f"incoming_{name}")
+                shutil.move(src_path, tmp)
+                os.replace(tmp, dest)
+                self._set(name, digest)
+                outcome = "updated" if existing else "new"
+            self._save()
+        return dest, outcome
+
+    def put_bytes(self, data: bytes, name: str) -> Tuple[str, str]:
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp = os.path.join(self.store_dir, f"fetched_{threading.get_ident()}_{name}")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        return self.put(tmp, name)
+
+
+_stores: Dict[str, ReportStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(folder: str) -> ReportStore:
+    folder = os.path.abspath(folder)
+    with _stores_lock:
+        if folder not in _stores:
+            _stores[folder] = ReportStore(folder)
+        return _stores[folder]
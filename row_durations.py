@@ -0,0 +1,140 @@
+"""
+Expected row durations learned from past runs, for longest-first scheduling and an ETA.
+
+Every downloader run records a "row" span per attempt in run_spans/ (see telemetry.py).
+The median of the successful ones per (report type, property code) is what that row is
+expected to take next time; a pair never seen falls back to the report type's median,
+then to the median of all rows, then to DEFAULT_ROW_S.
+
+report_runner.py gives long rows a higher queue priority, so a big property's General
+Ledger starts early instead of being the straggler one worker is still on at the end.
+The priorities are coarse (PRIORITY_STEP): the queue sorts by priority before page, so
+fine-grained ones would make a session change menu page for nearly every row. The
+runner prints an ETA line after every row (the Streamlit app shows it in its status
+line); it includes one menu walk ("navigate" spans) per page and priority group left.
+"""
+import os
+import json
+import math
+import statistics
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+import telemetry
+
+HISTORY_RUNS = 30          # newest download spans files read
+DEFAULT_ROW_S = 60.0       # no history at all
+DEFAULT_NAVIGATE_S = 10.0  # menu walk to a report form, when none was measured yet
+PRIORITY_STEP = 4.0        # rows within ~4x of each other share a priority (and stay grouped by page)
+MIN_PACE_ROWS = 3          # finished rows before the ETA corrects for this run being faster/slower
+PROGRESS_PREFIX = "⏳ Progress:"
+
+
+def fmt_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {secs:02d}s"
+
+
+def history_spans(runs: int = HISTORY_RUNS) -> Iterable[dict]:
+    """Successful "row" and "navigate" spans of the newest `runs` downloader runs."""
+    try:
+        names = [n for n in os.listdir(telemetry.SPANS_DIR) if n.startswith("download_") and n.endswith(".jsonl")]
+    except FileNotFoundError:
+        return
+    for name in sorted(names)[-runs:]:
+        with open(os.path.join(telemetry.SPANS_DIR, name), "r", encoding="utf-8") as f:
+            for line in f:
+                if '"step": "row"' not in line and '"step": "navigate"' not in line:
+                    continue
+                try:
+                    span = json.loads(line)
+                except ValueError:
+                    continue
+                if span.get("outcome") == "ok":
+                    yield span
+
+
+class DurationModel:
+    def __init__(self, spans: Iterable[dict]):
+        by_pair: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+        by_report: Dict[str, List[float]] = defaultdict(list)
+        every: List[float] = []
+        navigations: List[float] = []
+        for s in spans:
+            if s["step"] == "navigate":
+                navigations.append(s["seconds"])
+                continue
+            report, code = str(s.get("report", "")), str(s.get("code", "")).lower()
+            by_pair[(report, code)].append(s["seconds"])
+            by_report[report].append(s["seconds"])
+            every.append(s["seconds"])
+        self._pair = {k: statistics.median(v) for k, v in by_pair.items()}
+        self._report = {k: statistics.median(v) for k, v in by_report.items()}
+        self._all = statistics.median(every) if every else DEFAULT_ROW_S
+        self.rows_seen = len(every)
+        self.navigate_s = statistics.median(navigations) if navigations else DEFAULT_NAVIGATE_S
+
+    @classmethod
+    def from_history(cls, runs: int = HISTORY_RUNS) -> "DurationModel":
+        return cls(history_spans(runs))
+
+    def expected(self, report: str, code: str) -> float:
+        known = self._pair.get((report, str(code).lower()))
+        if known is not None:
+            return known
+        return self._report.get(report, self._all)
+
+    @staticmethod
+    def priority(seconds: float) -> int:
+        """Queue priority of a row expected to take `seconds`: longer = higher, in PRIORITY_STEP buckets."""
+        return int(math.log(max(seconds, 1.0), PRIORITY_STEP))
+
+
+class Eta:
+    """
+    Remaining time of a run: the expected seconds of the rows not done yet, scaled by how
+    this run's finished rows compare to their expectation, plus the menu walks of the groups
+    (page, priority) still to do (one per session working on a group), spread over the workers.
+    """
+
+    def __init__(self, expected: Dict[Hashable, float], workers: int, groups: Dict[Hashable, Hashable],
+                 navigate_s: float = DEFAULT_NAVIGATE_S):
+        self._expected = dict(expected)
+        self._groups = dict(groups)
+        self._navigate_s = navigate_s
+        self._workers = max(1, workers)
+        self._left = set(expected)
+        self._done_expected = 0.0
+        self._done_actual = 0.0
+        self._lock = threading.Lock()
+
+    def _navigations(self, keys) -> int:
+        rows = Counter(self._groups[k] for k in keys)
+        return sum(min(n, self._workers) for n in rows.values())
+
+    def plan_text(self) -> str:
+        """Expected total work and the best finish time it allows (the ideal split, or the longest row)."""
+        navigating = self._navigate_s * self._navigations(self._expected)
+        total = sum(self._expected.values()) + navigating
+        longest = max(self._expected.values(), default=0.0)
+        ideal = max(total / self._workers, longest)
+        return (f"⏱️ Expected work: {fmt_duration(total)} in {len(self._expected)} row(s) over "
+                f"{self._workers} worker(s), about {fmt_duration(ideal)} (longest row {fmt_duration(longest)})")
+
+    def done(self, key, seconds: float) -> str:
+        """Count a finished row (ok or failed for good); returns the progress line."""
+        with self._lock:
+            if key in self._left:
+                self._left.discard(key)
+                self._done_expected += self._expected[key]
+                self._done_actual += seconds
+            finished = len(self._expected) - len(self._left)
+            pace = 1.0
+            if finished >= MIN_PACE_ROWS and self._done_expected > 0:
+                pace = min(4.0, max(0.25, self._done_actual / self._done_expected))
+            left = [self._expected[k] * pace for k in self._left]
+            navigating = self._navigate_s * self._navigations(self._left)
+        remaining = max((sum(left) + navigating) / self._workers, max(left, default=0.0))
+        return f"{PROGRESS_PREFIX} {finished}/{len(self._expected)} rows, ETA {fmt_duration(remaining)}"
@@ -0,0 +1,120 @@
+"""
+Append-only journal of a downloader run (one JSON line per event).
+
+    {"ts": ..., "event": "pending" | "done" | "failed", "id": ..., "family": ..., "row": ...,
+     "fields": {"code": ..., "report_type": ..., "from": ...}, "outputs": [...]}
+
+Every job is written as "pending" before the browsers start, then "done"/"failed" the
+moment its result is known. Each line is flushed and fsync'd, so after a crash or an
+expired session the journal says exactly which rows still need work, and
+`report_runner.py --resume` continues from there instead of row 1.
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, Iterable, List, Optional
+
+JOURNAL_DIR = os.path.join(os.getcwd(), "run_journals")
+
+
+def new_journal_path() -> str:
+    # the pid keeps two runs started in the same second (e.g. two app jobs) apart
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+    return os.path.join(JOURNAL_DIR, f"run_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl")
+
+
+def journal_families(path: str) -> set:
+    """Families of a journal's jobs (from its leading "pending" records)."""
+    families = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("event") != "pending":
+                break
+            families.add(rec.get("family"))
+    return families
+
+
+def latest_journal_path(families: Optional[Iterable[str]] = None) -> Optional[str]:
+    """The newest journal, or with `families` the newest one that has jobs of any of them."""
+    try:
+        names = sorted((n for n in os.listdir(JOURNAL_DIR) if n.startswith("run_") and n.endswith(".jsonl")),
+                       reverse=True)
+    except FileNotFoundError:
+        return None
+    wanted = set(families) if families else None
+    for name in names:
+        path = os.path.join(JOURNAL_DIR, name)
+        if wanted is None or journal_families(path) & wanted:
+            return path
+    return None
+
+
+def as_output_list(output) -> List[str]:
+    if not output:
+        return []
+    return [output] if isinstance(output, str) else list(output)
+
+
+def load_journal(path: str) -> Dict[str, dict]:
+    """Last record per job id. A truncated last line (crash mid-write) is ignored."""
+    state = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                state[rec["id"]] = rec
+    except FileNotFoundError:
+        pass
+    return state
+
+
+def completed_ids(state: Dict[str, dict]) -> set:
+    """Ids whose last event is "done" and whose output files are all still on disk."""
+    return {
+        job_id for job_id, rec in state.items()
+        if rec["event"] == "done" and rec.get("outputs") and all(os.path.exists(p) for p in rec["outputs"])
+    }
+
+
+class RunJournal:
+    """Thread-safe appender; workers call done()/failed() as rows finish."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._f = open(path, "a", encoding="utf-8")
+
+    def _write(self, records: Iterable[dict]):
+        with self._lock:
+            for rec in records:
+                self._f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    @staticmethod
+    def record(event: str, entry: dict, **extra) -> dict:
+        rec = {"ts": time.strftime("%Y-%m-%d %H:%M:%S"), "event": event}
+        rec.update(entry)
+        rec.update(extra)
+        return rec
+
+    def pending(self, entries: Iterable[dict]):
+        self._write(self.record("pending", e) for e in entries)
+
+    def done(self, entry: dict, outputs: List[str], seconds: float):
+        self._write([self.record("done", entry, outputs=outputs, seconds=seconds)])
+
+    def failed(self, entry: dict, seconds: float):
+        self._write([self.record("failed", entry, outputs=[], seconds=seconds)])
+
+    def close(self):
+        with self._lock:
+            self._f.close()
@@ -0,0 +1,114 @@
+"""
+Per-row results of a downloader run (one JSON line per template row).
+
+    {"family": ..., "row": 7, "id": ..., "status": "ok" | "failed" | "rejected" | "skipped" |
+     "duplicate" | "already_done", "error_class": ..., "error": ..., "attempts": 2,
+     "seconds": 41.3, "worker": 1, "outputs": [...], "fields": {"code": ..., ...}}
+
+report_runner.py writes run_results/run_<stamp>.jsonl once the run ends, instead of
+colouring failed rows red in the template (which needed the template closed in Excel
+and a full workbook load and save). An xlsx view of the failures is built only when asked:
+
+    python run_results.py                        # summary of the latest run
+    python run_results.py --xlsx failures.xlsx   # ... plus the failed/rejected rows as a workbook
+    python run_results.py run_results/run_20250901_080000_4242.jsonl --xlsx failures.xlsx
+"""
+import os
+import json
+import time
+from collections import Counter
+from typing import Iterable, List, Optional
+
+RESULTS_DIR = os.path.join(os.getcwd(), "run_results")
+
+FIELDS = ("family", "row", "id", "status", "error_class", "error", "attempts", "seconds", "worker", "outputs", "fields")
+PROBLEM_STATUSES = ("failed", "rejected")
+
+
+def new_results_path() -> str:
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    return os.path.join(RESULTS_DIR, f"run_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl")
+
+
+def latest_results_path() -> Optional[str]:
+    try:
+        names = sorted(n for n in os.listdir(RESULTS_DIR) if n.startswith("run_") and n.endswith(".jsonl"))
+    except FileNotFoundError:
+        return None
+    return os.path.join(RESULTS_DIR, names[-1]) if names else None
+
+
+def make_record(family: str, row: int, status: str, **extra) -> dict:
+    rec = {"family": family, "row": row, "id": None, "status": status, "error_class": None, "error": None,
+           "attempts": 0, "seconds": 0.0, "worker": None, "outputs": [], "fields": {}}
+    rec.update(extra)
+    return rec
+
+
+def write_results(path: str, records: Iterable[dict]) -> int:
+    """Write the records (sorted by family, row) in one go; a half-written file never replaces a good one."""
+    records = sorted(records, key=lambda r: (r["family"], r["row"]))
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps({k: rec.get(k) for k in FIELDS}, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+    return len(records)
+
+
+def load_results(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def print_results_summary(records: List[dict], path: str):
+    by_status = Counter(r["status"] for r in records)
+    print(f"\n🧾 Results: {path}")
+    print("   " + ", ".join(f"{n} {s}" for s, n in sorted(by_status.items())))
+    errors = Counter(r["error_class"] for r in records if r["status"] in PROBLEM_STATUSES)
+    for error_class, n in errors.most_common():
+        print(f"   {n:>5} × {error_class}")
+
+
+def failures_xlsx(records: List[dict], xlsx_path: str) -> int:
+    """Failed and rejected rows as one sheet: family, row, status, error and the row's template values."""
+    from openpyxl import Workbook
+
+    problems = [r for r in records if r["status"] in PROBLEM_STATUSES]
+    field_names: List[str] = []
+    for r in problems:
+        field_names += [k for k in r["fields"] if k not in field_names]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Failures")
+    ws.append(["Family", "Row", "Status", "Error class", "Error", "Attempts", "Seconds"] + field_names)
+    for r in problems:
+        ws.append([r["family"], r["row"], r["status"], r["error_class"], r["error"], r["attempts"], r["seconds"]]
+                  + [r["fields"].get(k, "") for k in field_names])
+    wb.save(xlsx_path)
+    return len(problems)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize a downloader run's per-row results.")
+    parser.add_argument("results", nargs="?", help="results file (default: the latest in run_results/)")
+    parser.add_argument("--xlsx", metavar="OUT", help="also write the failed/rejected rows to this workbook")
+    args = parser.parse_args()
+
+    path = args.results or latest_results_path()
+    if not path or not os.path.exists(path):
+        parser.error("no results file found (run report_runner.py first)")
+    records = load_results(path)
+    print_results_summary(records, path)
+    if args.xlsx:
+        try:
+            n = failures_xlsx(records, args.xlsx)
+            print(f"📘 {n} failed/rejected row(s) written to {args.xlsx}")
+        except PermissionError:
+            print(f"⛔ Cannot save '{args.xlsx}'. Please close the file if it's open and try again.")
+
+
+if __name__ == "__main__":
+    main()
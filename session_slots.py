@@ -0,0 +1,82 @@
+"""
+Saved Yardi logins, one slot per parallel browser session.
+
+A slot is session_slots/s<N>.json with the cookies of the last login made in it, plus an
+OS lock on s<N>.lock held for as long as a process uses the slot. Two downloader
+processes (e.g. two jobs started from the Streamlit app) therefore never share one
+Yardi session, and a crashed process can't leave a slot locked. The cookie files are
+credentials: they stay on this PC (session_slots/ is git-ignored).
+"""
+import os
+import json
+import time
+from typing import List, Optional
+
+SLOTS_DIR = os.path.join(os.getcwd(), "session_slots")
+MAX_SLOTS = 32
+COOKIE_MAX_AGE = 12 * 3600   # an older login isn't worth trying
+COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+
+def _try_lock(f) -> bool:
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class Slot:
+    def __init__(self, number: int, lock_file):
+        self.number = number
+        self._lock_file = lock_file
+        self.cookie_path = os.path.join(SLOTS_DIR, f"s{number}.json")
+
+    def load_cookies(self) -> List[dict]:
+        """Cookies of the slot's last login, [] when there is none or it is too old."""
+        try:
+            if time.time() - os.path.getmtime(self.cookie_path) > COOKIE_MAX_AGE:
+                return []
+            with open(self.cookie_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def save_cookies(self, cookies: List[dict]):
+        tmp = self.cookie_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([{k: c[k] for k in COOKIE_KEYS if k in c} for c in cookies], f)
+        os.replace(tmp, self.cookie_path)
+
+    def forget(self):
+        """Drop the saved login (it was rejected by the server)."""
+        try:
+            os.remove(self.cookie_path)
+        except FileNotFoundError:
+            pass
+
+    def release(self):
+        if self._lock_file:
+            self._lock_file.close()   # closing the handle releases the OS lock
+            self._lock_file = None
+
+
+def acquire_slot(prefer: Optional[int] = None) -> Slot:
+    """The first slot no other process holds (`prefer` first), locked until release()."""
+    os.makedirs(SLOTS_DIR, exist_ok=True)
+    numbers = list(range(1, MAX_SLOTS + 1))
+    if prefer in numbers:
+        numbers.remove(prefer)
+        numbers.insert(0, prefer)
+    for n in numbers:
+        f = open(os.path.join(SLOTS_DIR, f"s{n}.lock"), "a+b")
+        if _try_lock(f):
+            return Slot(n, f)
+        f.close()
+    raise RuntimeError(f"All {MAX_SLOTS} browser session slots are in use by other downloader processes.")
@@ -0,0 +1,88 @@
+"""
+Resource watchdog for long batches.
+
+A browser that has rendered hundreds of iframe-heavy report pages keeps growing and
+gets slower. After every row the worker asks its session's SessionHealth whether the
+browser should be restarted:
+  • its memory (RSS of the driver and every browser process under it) is above MAX_RSS_MB
+  • recent rows on a page take SLOWDOWN times as long as the first rows on that page did
+  • it has done MAX_ROWS rows (off by default)
+yardi_session.recycle_session() then swaps in a fresh browser between two rows, so
+no row is lost. Memory checks need psutil; without it only row times are watched.
+"""
+import os
+import statistics
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MAX_RSS_MB = float(os.environ.get("YARDI_MAX_RSS_MB", "1500"))
+SLOWDOWN = float(os.environ.get("YARDI_SLOWDOWN", "2.0"))
+MIN_SLOWDOWN_S = 3.0       # ignore "twice as slow" when that is only a second or two
+MAX_ROWS = int(os.environ.get("YARDI_RECYCLE_ROWS", "0"))
+BASELINE_ROWS = 5          # first rows per page of the session = the expected row time (kept across restarts)
+RECENT_ROWS = 5
+
+
+def browser_rss_mb(driver) -> Optional[float]:
+    """Memory of the driver process and all browser processes it started, in MB (None if unknown)."""
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+    total = 0
+    for p in procs:
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 2 ** 20
+
+
+class SessionHealth:
+    def __init__(self):
+        self.rows = 0
+        self.restarts = 0
+        self.peak_rss_mb = 0.0
+        self._baseline: Dict[object, List[float]] = defaultdict(list)
+        self._recent: Dict[object, Deque[float]] = defaultdict(lambda: deque(maxlen=RECENT_ROWS))
+
+    def observe(self, page, seconds: float):
+        """Time of one successful row on `page`."""
+        self.rows += 1
+        base = self._baseline[page]
+        if len(base) < BASELINE_ROWS:
+            base.append(seconds)
+        else:
+            self._recent[page].append(seconds)
+
+    def check(self, driver) -> Optional[str]:
+        """Why the browser should be restarted now, or None."""
+        if MAX_ROWS and self.rows >= MAX_ROWS:
+            return f"{self.rows} rows since the browser started"
+        rss = browser_rss_mb(driver)
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+            if rss > MAX_RSS_MB:
+                return f"browser uses {rss:.0f} MB (limit {MAX_RSS_MB:.0f} MB)"
+        for page, recent in self._recent.items():
+            if len(recent) < RECENT_ROWS:
+                continue
+            expected = statistics.median(self._baseline[page])
+            now = statistics.median(recent)
+            if now > expected * SLOWDOWN and now - expected > MIN_SLOWDOWN_S:
+                return f"rows take {now:.1f}s, were {expected:.1f}s"
+        return None
+
+    def restarted(self):
+        """A fresh browser: count it and start the row/slowdown bookkeeping over (the baseline stays)."""
+        self.restarts += 1
+        self.rows = 0
+        self._recent.clear()
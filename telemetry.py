@@ -0,0 +1,159 @@
+"""
+Per-step timing spans, one JSON line per step, so tuning is based on measured data.
+
+    {"ts": "2025-09-01 08:00:01", "step": "display", "seconds": 4.21, "outcome": "ok", "error": null,
+     "worker": 2, "family": "financial_analytics", "report": "Trial Balance", "code": "abc"}
+
+report_runner.py writes run_spans/download_<stamp>.jsonl and consolidation.py writes
+run_spans/consolidate_<stamp>.jsonl. `with span("step"):` times a block (an exception
+records outcome "error" with the exception class and is re-raised); `with tags(report=...)` adds
+attributes to every span the current thread records inside it. Nothing is written
+until start() is called, so library use (benchmarks, the app) costs nothing.
+
+    python telemetry.py                      # p50/p95 per step, latest spans file
+    python telemetry.py --by report          # ... per step and report type
+    python telemetry.py run_spans/consolidate_20250901_080000_4242.jsonl --by category
+"""
+import os
+import json
+import time
+import threading
+import contextlib
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+SPANS_DIR = os.path.join(os.getcwd(), "run_spans")
+FAILED_OUTCOMES = ("error", "failed", "missing", "no_output")
+
+_writer = None
+_write_lock = threading.Lock()
+_local = threading.local()
+
+
+def start(kind: str) -> str:
+    """Open run_spans/<kind>_<stamp>_<pid>.jsonl for this process' spans; returns its path."""
+    global _writer
+    os.makedirs(SPANS_DIR, exist_ok=True)
+    path = os.path.join(SPANS_DIR, f"{kind}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl")
+    stop()
+    with _write_lock:
+        _writer = open(path, "a", encoding="utf-8", buffering=1)
+    return path
+
+
+def stop():
+    global _writer
+    with _write_lock:
+        if _writer:
+            _writer.close()
+            _writer = None
+
+
+def record(step: str, seconds: float, outcome: str = "ok", **attrs):
+    """Write one span measured elsewhere (e.g. in a worker process)."""
+    if _writer is None:
+        return
+    rec = {"ts": time.strftime("%Y-%m-%d %H:%M:%S"), "step": step, "seconds": round(seconds, 3),
+           "outcome": outcome, "error": None}
+    rec.update(getattr(_local, "tags", {}))
+    rec.update(attrs)
+    line = json.dumps(rec, ensure_ascii=False, default=str) + "\n"
+    with _write_lock:
+        if _writer:
+            _writer.write(line)
+
+
+@contextlib.contextmanager
+def tags(**attrs):
+    """Attributes (family, report, code, worker...) for every span this thread records inside the block."""
+    previous = getattr(_local, "tags", {})
+    _local.tags = {**previous, **attrs}
+    try:
+        yield
+    finally:
+        _local.tags = previous
+
+
+@contextlib.contextmanager
+def span(step: str, **attrs):
+    """
+    Time the block as `step`. The yielded dict can override "outcome" (e.g. "missing") or add
+    attributes; an exception records its class as the outcome and propagates.
+    """
+    rec = {"outcome": "ok"}
+    started = time.perf_counter()
+    try:
+        yield rec
+    except BaseException as e:
+        rec["outcome"] = "error"
+        rec["error"] = type(e).__name__
+        raise
+    finally:
+        outcome = rec.pop("outcome")
+        record(step, time.perf_counter() - started, outcome, **{**attrs, **rec})
+
+
+# ====== Summary ======
+def latest_spans_path() -> Optional[str]:
+    try:
+        names = [n for n in os.listdir(SPANS_DIR) if n.endswith(".jsonl")]
+    except FileNotFoundError:
+        return None
+    if not names:
+        return None
+    return max((os.path.join(SPANS_DIR, n) for n in names), key=os.path.getmtime)
+
+
+def load_spans(path: str) -> List[dict]:
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue   # a line cut short by a crash
+    return spans
+
+
+def _pct(vals: List[float], q: float) -> float:
+    return vals[min(len(vals) - 1, int(len(vals) * q))]
+
+
+def summarize(spans: List[dict], by: Optional[str] = None) -> List[str]:
+    """Table lines: count, failures, p50/p95/max and total seconds per step (and per `by` value)."""
+    groups: Dict[tuple, List[dict]] = defaultdict(list)
+    for s in spans:
+        groups[(s["step"], str(s.get(by, "")) if by else "")].append(s)
+    label = f"step{' / ' + by if by else ''}"
+    lines = [f"{label:<44} {'n':>6} {'failed':>6} {'p50':>8} {'p95':>8} {'max':>8} {'total':>9}"]
+    for (step, value), group in sorted(groups.items(), key=lambda kv: -sum(s["seconds"] for s in kv[1])):
+        vals = sorted(s["seconds"] for s in group)
+        bad = sum(1 for s in group if s["outcome"] in FAILED_OUTCOMES)
+        name = f"{step} / {value}" if by else step
+        lines.append(f"{name[:44]:<44} {len(vals):>6} {bad:>6} {_pct(vals, 0.5):>7.2f}s {_pct(vals, 0.95):>7.2f}s "
+                     f"{vals[-1]:>7.2f}s {sum(vals):>8.1f}s")
+    return lines
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="p50/p95 per step from a spans file.")
+    parser.add_argument("spans", nargs="?", help="spans file (default: the newest in run_spans/)")
+    parser.add_argument("--by", metavar="TAG", help="also split by a tag, e.g. report, family, category, worker")
+    parser.add_argument("--step", action="append", help="only these steps (repeatable)")
+    args = parser.parse_args()
+
+    path = args.spans or latest_spans_path()
+    if not path or not os.path.exists(path):
+        parser.error("no spans file found (run report_runner.py or consolidation.py first)")
+    spans = load_spans(path)
+    if args.step:
+        spans = [s for s in spans if s["step"] in args.step]
+    print(f"⏱️ {path}: {len(spans)} span(s)\n")
+    for line in summarize(spans, args.by):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Condition-based waits for the Yardi pages, replacing fixed time.sleep calls.
+
+Before an action that may post back, mark_page() tags every frame's window
+object. A real postback or iframe reload throws that window away, so "the tag is
+gone and readyState is complete" means the new page is there. A page that only
+does an ASP.NET async (UpdatePanel) postback keeps its tag, so we also wait for
+PageRequestManager and jQuery to go idle.
+
+Every wait records how long it actually took (WAIT_STATS), so the real server
+time per step shows up in the run summary instead of a guessed sleep.
+"""
+import time
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+POLL = 0.1
+# A synchronous __doPostBack starts navigating a moment after the click; don't call the page idle before that
+POSTBACK_GRACE = 0.15
+
+WAIT_STATS: Dict[str, List[float]] = defaultdict(list)
+_stats_lock = threading.Lock()
+
+MARK_JS = """
+const mark = (w) => { try { w.__yardiMark = 1; w.addEventListener('beforeunload', () => { w.__yardiUnloading = 1; }); } catch (e) {} };
+const walk = (w) => { mark(w); for (let i = 0; i < w.frames.length; i++) { try { walk(w.frames[i]); } catch (e) {} } };
+walk(window.top);
+"""
+
+# true once the current frame is loaded and not posting back
+IDLE_JS = """
+const w = window;
+if (w.__yardiUnloading) return false;
+if (document.readyState !== 'complete') return false;
+try {
+    if (w.Sys && Sys.WebForms && Sys.WebForms.PageRequestManager &&
+        Sys.WebForms.PageRequestManager.getInstance().get_isInAsyncPostBack()) return false;
+} catch (e) {}
+if (w.jQuery && w.jQuery.active > 0) return false;
+return true;
+"""
+
+# arguments[0] = iframe index in the top document (negative counts from the end)
+FRESH_IFRAME_JS = """
+const frames = window.top.document.getElementsByTagName('iframe');
+if (!frames.length) return false;
+const idx = arguments[0] < 0 ? frames.length + arguments[0] : arguments[0];
+const f = frames[idx];
+if (!f) return false;
+try {
+    const w = f.contentWindow;
+    if (w.__yardiMark) return false;
+    return w.document.readyState === 'complete' && w.location.href !== 'about:blank';
+} catch (e) { return false; }
+"""
+
+
+def record(name: str, seconds: float):
+    with _stats_lock:
+        WAIT_STATS[name].append(seconds)
+
+
+def timed_wait(session, name: str, condition: Callable, timeout: float = 30):
+    """WebDriverWait.until with a short poll, recording the elapsed time under `name`."""
+    started = time.perf_counter()
+    try:
+        return WebDriverWait(session.driver, timeout, poll_frequency=POLL).until(condition)
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def mark_page(session):
+    """Tag every frame so a later wait can tell the old document from the new one."""
+    session.driver.execute_script(MARK_JS)
+
+
+def wait_postback(session, name: str = "postback", timeout: float = 30):
+    """Wait until the current frame finished any postback triggered since mark_page()."""
+    time.sleep(POSTBACK_GRACE)
+
+    def _idle(driver):
+        try:
+            return driver.execute_script(IDLE_JS)
+        except WebDriverException:
+            # the frame is being replaced right now
+            return False
+
+    return timed_wait(session, name, _idle, timeout)
+
+
+def wait_fresh_iframe(session, index: int, name: str = "iframe", timeout: float = 20):
+    """
+    Wait until iframe[index] of the top document holds a newly loaded document (not the one
+    marked before the click). If the click didn't replace that frame, fall back to the current one.
+    """
+    try:
+        timed_wait(session, name, lambda d: d.execute_script(FRESH_IFRAME_JS, index), timeout)
+        return True
+    except TimeoutException:
+        session.log(f"ℹ️ iframe[{index}] was not reloaded within {timeout}s; using the current one")
+        return False
+
+
+def summary_lines() -> List[str]:
+    """p50 / p95 / max per wait condition, slowest total first."""
+    with _stats_lock:
+        items = {k: sorted(v) for k, v in WAIT_STATS.items() if v}
+    lines = []
+    for name, vals in sorted(items.items(), key=lambda kv: -sum(kv[1])):
+        p50 = vals[len(vals) // 2]
+        p95 = vals[min(len(vals) - 1, int(len(vals) * 0.95))]
+        lines.append(f"   {name:<18} n={len(vals):<5} p50={p50:5.2f}s  p95={p95:5.2f}s  max={vals[-1]:5.2f}s  "
+                     f"total={sum(vals):7.1f}s")
+    return lines
+
+
+def print_summary():
+    lines = summary_lines()
+    if lines:
+        print("\n⏱️ Wait conditions (actual time spent):")
+        for line in lines:
+            print(line)
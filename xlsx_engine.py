@@ -0,0 +1,182 @@
+"""
+Pure-Python (openpyxl) sheet copying for consolidation.py.
+
+Mirrors what the Excel COM path does with Worksheet.Copy: values, cell styles,
+merged ranges, column widths, row heights and the basic sheet view, plus the
+Budget Comparison MTD/YTD header fix. Runs anywhere openpyxl runs (no Excel needed).
+"""
+from copy import copy
+from typing import Dict, Optional, Tuple
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.cell import MergedCell
+from openpyxl.styles import Alignment
+from openpyxl.utils import get_column_letter, column_index_from_string
+
+
+def ensure_unique_sheet_name(wb: Workbook, base: str) -> str:
+    name = base[:31]
+    existing = set(wb.sheetnames)
+    if name not in existing:
+        return name
+    i = 2
+    while True:
+        cand = (f"{name[:29]} {i}") if len(name) > 29 else f"{name} {i}"
+        if cand not in existing:
+            return cand
+        i += 1
+
+
+def find_notes_header(ws) -> Optional[Tuple[int, int]]:
+    """(header_row, notes_col) of the BC header row holding 'Annual' and 'Note/Notes', else None."""
+    for r, row in enumerate(ws.iter_rows(min_row=1, max_row=20, max_col=79, values_only=True), start=1):
+        vals = [str(v).strip() if v is not None else "" for v in row]
+        if "Annual" in vals and any(v.lower() in ("note", "notes") for v in vals):
+            idx = next(i for i, v in enumerate(vals) if v.lower() in ("note", "notes"))
+            return r, idx + 1
+    return None
+
+
+class _StyleCache:
+    """Translate source style ids into destination style ids once per distinct style."""
+
+    def __init__(self):
+        self._map: Dict[tuple, object] = {}
+
+    def apply(self, src, dst):
+        key = tuple(src._style)
+        cached = self._map.get(key)
+        if cached is not None:
+            dst._style = copy(cached)
+            return
+        dst.font = copy(src.font)
+        dst.border = copy(src.border)
+        dst.fill = copy(src.fill)
+        dst.number_format = src.number_format
+        dst.protection = copy(src.protection)
+        dst.alignment = copy(src.alignment)
+        self._map[key] = copy(dst._style)
+
+
+def _copy_sheet_setup(src_ws, dst_ws):
+    dst_ws.freeze_panes = src_ws.freeze_panes
+    dst_ws.sheet_view.showGridLines = src_ws.sheet_view.showGridLines
+    dst_ws.sheet_view.zoomScale = src_ws.sheet_view.zoomScale
+    dst_ws.sheet_format = copy(src_ws.sheet_format)
+    dst_ws.page_setup.orientation = src_ws.page_setup.orientation
+    dst_ws.page_setup.fitToWidth = src_ws.page_setup.fitToWidth
+    dst_ws.page_setup.fitToHeight = src_ws.page_setup.fitToHeight
+    dst_ws.print_options.horizontalCentered = src_ws.print_options.horizontalCentered
+    dst_ws.page_margins = copy(src_ws.page_margins)
+    if src_ws.sheet_properties.tabColor is not None:
+        dst_ws.sheet_properties.tabColor = copy(src_ws.sheet_properties.tabColor)
+
+
+def last_used_col(ws, header_row: int) -> int:
+    last = 1
+    for cell in ws[header_row]:
+        if cell.value is not None and str(cell.value).strip():
+            last = cell.column
+    return last
+
+
+def extend_top_merges(ws, last_col: int, rows=(1, 2, 3)):
+    """Re-span the top heading merges to the current last_col."""
+    for r in rows:
+        # find first non-empty cell on the row
+        start_c = None
+        for c in range(1, min(60, last_col) + 1):
+            v = ws.cell(row=r, column=c).value
+            if v is not None and str(v).strip() != "":
+                start_c = c
+                break
+        if not start_c:
+            continue
+
+        # get original left edge of merge (if any)
+        left_col = start_c
+        for rng in list(ws.merged_cells.ranges):
+            if rng.min_row <= r <= rng.max_row and rng.min_col <= start_c <= rng.max_col:
+                left_col = rng.min_col
+                ws.unmerge_cells(rng.coord)
+                break
+
+        try:
+            ws.merge_cells(start_row=r, start_column=left_col, end_row=r, end_column=last_col)
+            top_left = ws.cell(row=r, column=left_col)
+            al = copy(top_left.alignment)
+            top_left.alignment = Alignment(horizontal="center", vertical=al.vertical, wrap_text=al.wrap_text)
+        except ValueError:
+            # if some conflicting merge exists, skip quietly
+            pass
+
+
+def copy_first_sheet(src_path: str, dest_wb: Workbook, new_name: str, add_mtd: bool = False):
+    """
+    Copy the first sheet of `src_path` to the end of `dest_wb` as `new_name`.
+    With add_mtd (regular Budget Comparison only) a blank 'MTD' column is inserted at Notes,
+    Notes becomes 'YTD' and the 3-line banner is re-merged to the new last column.
+    """
+    src_wb = load_workbook(src_path)
+    try:
+        src_ws = src_wb.worksheets[0]
+        dst_ws = dest_wb.create_sheet(ensure_unique_sheet_name(dest_wb, new_name))
+        styles = _StyleCache()
+
+        header = find_notes_header(src_ws) if add_mtd else None
+        note_col = header[1] if header else None
+
+        def map_col(c: int) -> int:
+            return c + 1 if note_col and c >= note_col else c
+
+        for row in src_ws.iter_rows():
+            for cell in row:
+                dst = dst_ws.cell(row=cell.row, column=map_col(cell.column))
+                if not isinstance(cell, MergedCell):
+                    dst.value = cell.value
+                    if cell.hyperlink:
+                        dst.hyperlink = copy(cell.hyperlink)
+                if cell.has_style:
+                    styles.apply(cell, dst)
+
+        for rng in src_ws.merged_cells.ranges:
+            min_c, max_c = map_col(rng.min_col), map_col(rng.max_col)
+            # a merge that spans the Notes column also absorbs the inserted column
+            if note_col and rng.min_col < note_col <= rng.max_col:
+                min_c = rng.min_col
+            dst_ws.merge_cells(start_row=rng.min_row, start_column=min_c, end_row=rng.max_row, end_column=max_c)
+
+        for key, dim in src_ws.column_dimensions.items():
+            lo = dim.min or column_index_from_string(key)
+            hi = dim.max or lo
+            for c in range(lo, hi + 1):
+                dd = dst_ws.column_dimensions[get_column_letter(map_col(c))]
+                if dim.width:
+                    dd.width = dim.width
+                dd.hidden = dim.hidden
+        for r, dim in src_ws.row_dimensions.items():
+            if dim.height is not None:
+                dst_ws.row_dimensions[r].height = dim.height
+            if dim.hidden:
+                dst_ws.row_dimensions[r].hidden = True
+
+        _copy_sheet_setup(src_ws, dst_ws)
+
+        if header:
+            header_row = header[0]
+            # Excel's column insert takes the formatting of the column to its left
+            if note_col > 1:
+                for r in range(1, dst_ws.max_row + 1):
+                    left = dst_ws.cell(row=r, column=note_col - 1)
+                    if left.has_style and not isinstance(dst_ws.cell(row=r, column=note_col), MergedCell):
+                        dst_ws.cell(row=r, column=note_col)._style = copy(left._style)
+            dst_ws.cell(row=header_row, column=note_col).value = "MTD"
+            dst_ws.cell(row=header_row, column=note_col + 1).value = "YTD"   # old Notes shifted right
+            # match width only (no format or data copy)
+            yt_width = dst_ws.column_dimensions[get_column_letter(note_col + 1)].width
+            if yt_width:
+                dst_ws.column_dimensions[get_column_letter(note_col)].width = yt_width
+            extend_top_merges(dst_ws, last_used_col(dst_ws, header_row), rows=(1, 2, 3))
+        return dst_ws
+    finally:
+        src_wb.close()
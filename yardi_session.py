@@ -0,0 +1,710 @@
+import os
+import time
+import atexit
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import urllib3
+from selenium import webdriver
+from selenium.webdriver.edge.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+import telemetry
+from download_watcher import DownloadWatcher
+from error_classes import (BACKOFF_FACTOR, BROWSER_GONE, DOWNLOAD_MISSING, SERVER_ERROR, SESSION_EXPIRED,
+                           SESSION_KINDS, STALE_FRAME, classify_exception, is_server_error_page)
+from job_queue import JobQueue
+from session_slots import Slot, acquire_slot
+from session_watchdog import SessionHealth
+from report_specs import MENU_URL
+
+# === Setup Paths ===
+driver_path = r"edgedriver\msedgedriver.exe"
+project_folder = os.getcwd()
+reports_folder = os.path.join(project_folder, "All_reports")
+# each session downloads into <root>/w<N>; the Streamlit app gives every job its own root
+worker_downloads_root = os.environ.get("YARDI_DOWNLOADS_DIR") or os.path.join(project_folder, "Downloads_workers")
+
+# Number of parallel browser sessions (overridable with report_runner.py --workers)
+WORKERS = int(os.environ.get("YARDI_WORKERS", "1"))
+
+# Unattended runs (servers, benchmarks against the mock server): no browser window, no login prompt
+HEADLESS = os.environ.get("YARDI_HEADLESS", "") == "1"
+BROWSERS = ("edge", "chrome", "chromium", "firefox")
+BROWSER = os.environ.get("YARDI_BROWSER", "edge").lower()
+PAGE_LOAD = os.environ.get("YARDI_PAGE_LOAD", "eager")          # "normal" waits for every image/script
+BLOCK_ASSETS = os.environ.get("YARDI_BLOCK_ASSETS", "1") != "0"  # images, fonts, analytics
+MANUAL_LOGIN = os.environ.get("YARDI_LOGIN", "manual") != "none"
+
+# Only the logged-in menu page has the top-level menu items (the login page has none)
+MENU_MARKER = (By.CSS_SELECTOR, "#mi0, #mi1")
+
+_print_lock = threading.Lock()
+_login_lock = threading.Lock()   # one login prompt at a time when workers restart their browsers
+
+
+class Session:
+    """One logged-in browser window, the private download folder it saves into and its login slot."""
+
+    def __init__(self, worker_id: int, driver, wait, downloads: DownloadWatcher, tagged: bool,
+                 slot: Optional[Slot] = None):
+        self.worker_id = worker_id
+        self.driver = driver
+        self.wait = wait
+        self.downloads = downloads
+        self.slot = slot
+        self.page = None          # menu page the window is currently on
+        self.main_window = None   # handle of the window holding the report form
+        self.tag = f"[w{worker_id}] " if tagged else ""
+        self.health = SessionHealth()
+        self.wait_timeout = 20
+
+    def log(self, msg: str):
+        with _print_lock:
+            print(f"{self.tag}{msg}")
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.downloads.stop()
+        if self.slot:
+            self.slot.release()
+
+
+# Assets a report page doesn't need: skipping them saves bandwidth, CPU and memory per session
+BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.ico", "*.svg", "*.woff", "*.woff2", "*.ttf", "*.eot",
+                "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*hotjar.com*"]
+
+XLSX_MIME = ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet,"
+             "application/vnd.ms-excel,application/octet-stream")
+
+
+def build_options(download_dir: str, browser: Optional[str] = None):
+    browser = browser or BROWSER
+    if browser == "firefox":
+        options = webdriver.FirefoxOptions()
+        if HEADLESS:
+            options.add_argument("-headless")
+            options.add_argument("--width=1920")
+            options.add_argument("--height=1080")
+        for key, value in {
+            "browser.download.folderList": 2,
+            "browser.download.dir": download_dir,
+            "browser.download.useDownloadDir": True,
+            "browser.helperApps.neverAsk.saveToDisk": XLSX_MIME,
+            "browser.download.manager.showWhenStarting": False,
+            "pdfjs.disabled": True,
+        }.items():
+            options.set_preference(key, value)
+        if BLOCK_ASSETS:
+            options.set_preference("permissions.default.image", 2)
+            options.set_preference("gfx.downloadable_fonts.enabled", False)
+    else:
+        options = Options() if browser == "edge" else webdriver.ChromeOptions()
+        if browser == "edge":
+            options.use_chromium = True
+        options.add_argument("--start-maximized")
+        options.add_argument("--log-level=3")
+        if HEADLESS:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+            options.add_argument("--disable-gpu")
+        if os.name != "nt":
+            options.add_argument("--disable-dev-shm-usage")   # small /dev/shm in containers
+            if hasattr(os, "geteuid") and os.geteuid() == 0:
+                options.add_argument("--no-sandbox")          # Chromium refuses to run as root otherwise
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        prefs = {
+            "download.default_directory": download_dir,
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+        }
+        if BLOCK_ASSETS:
+            prefs["profile.managed_default_content_settings.images"] = 2
+        options.add_experimental_option("prefs", prefs)
+    # DOMContentLoaded is enough: waits.py checks readyState/postbacks itself where it matters
+    options.page_load_strategy = PAGE_LOAD
+    return options
+
+
+def _driver_service(browser: str):
+    """
+    Driver executable: the bundled msedgedriver on the office PCs, else webdriver-manager
+    (downloads and caches a matching driver), else Selenium Manager when that fails (e.g. offline).
+    """
+    services = {"edge": EdgeService, "chrome": ChromeService, "chromium": ChromeService, "firefox": FirefoxService}
+    if browser == "edge" and os.path.exists(driver_path):
+        return EdgeService(executable_path=driver_path)
+    try:
+        if browser == "edge":
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager as manager
+            path = manager().install()
+        elif browser == "firefox":
+            from webdriver_manager.firefox import GeckoDriverManager as manager
+            path = manager().install()
+        else:
+            from webdriver_manager.chrome import ChromeDriverManager
+            from webdriver_manager.core.os_manager import ChromeType
+            path = ChromeDriverManager(
+                chrome_type=ChromeType.CHROMIUM if browser == "chromium" else ChromeType.GOOGLE).install()
+        return services[browser](executable_path=path)
+    except Exception as e:
+        print(f"ℹ️ webdriver-manager could not provide a {browser} driver ({e}); using Selenium Manager")
+        return services[browser]()
+
+
+def make_driver(download_dir: str, browser: Optional[str] = None):
+    browser = browser or BROWSER
+    if browser not in BROWSERS:
+        raise ValueError(f"Unknown browser {browser!r} (choose from {', '.join(BROWSERS)})")
+    options = build_options(download_dir, browser)
+    service = _driver_service(browser)
+    if browser == "firefox":
+        return webdriver.Firefox(service=service, options=options)
+    if browser == "edge":
+        driver = webdriver.Edge(service=service, options=options)
+    else:
+        driver = webdriver.Chrome(service=service, options=options)
+    if BLOCK_ASSETS:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        except WebDriverException:
+            pass
+    return driver
+
+
+def open_session(worker_id: int, workers: int, wait_timeout: int = 20) -> Session:
+    """
+    Launch one browser window (YARDI_BROWSER, Edge by default) that downloads into its own
+    folder (Downloads_workers/w<N>), so nothing else in ~/Downloads or another session can
+    be mistaken for our file.
+    """
+    slot = acquire_slot(prefer=worker_id)
+    downloads = DownloadWatcher(os.path.join(worker_downloads_root, f"w{worker_id}"))
+    downloads.clear_folder()
+    downloads.start()
+    try:
+        driver = make_driver(downloads.folder)
+    except Exception:
+        downloads.stop()
+        slot.release()
+        raise
+    session = Session(worker_id, driver, WebDriverWait(driver, wait_timeout), downloads, tagged=workers > 1, slot=slot)
+    session.wait_timeout = wait_timeout
+    return session
+
+
+def is_logged_in(session: Session, reload: bool = True, timeout: float = 5) -> bool:
+    """Is the window on (or, with reload, does MENU_URL lead to) the logged-in Yardi menu?"""
+    driver = session.driver
+    driver.switch_to.default_content()
+    if reload:
+        driver.get(MENU_URL)
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located(MENU_MARKER))
+        return True
+    except TimeoutException:
+        return False
+
+
+def restore_login(session: Session) -> bool:
+    """Log in with the cookies saved in the session's slot by an earlier run, if they still work."""
+    cookies = session.slot.load_cookies() if session.slot else []
+    if not cookies:
+        return False
+    driver = session.driver
+    driver.delete_all_cookies()
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException:
+            pass   # e.g. a cookie of another Yardi host
+    if is_logged_in(session):
+        session.log("🔑 Logged in with the saved session")
+        return True
+    session.slot.forget()
+    return False
+
+
+def login_sessions(sessions: List[Session]):
+    """
+    Make sure every window is on the logged-in Yardi menu. A window still logged in from
+    an earlier run_jobs (warm pool) or whose slot has working saved cookies needs no
+    login; only the rest are left for the user to log in manually, in one prompt.
+    Working logins are saved back to the slots for the next run.
+    """
+    for s in sessions:
+        s.driver.get(MENU_URL)
+    need = [s for s in sessions if not is_logged_in(s, reload=False) and not restore_login(s)]
+    logged_out = need
+    if need and MANUAL_LOGIN:
+        tags = ", ".join(f"w{s.worker_id}" for s in need) if len(sessions) > 1 else ""
+        if len(need) == 1:
+            input(f"🔐 Please log in manually{f' in browser window {tags}' if tags else ''} "
+                  f"and press ENTER here to continue...")
+        else:
+            input(f"🔐 Please log in manually in {len(need)} browser windows ({tags}) "
+                  f"and press ENTER here to continue...")
+        logged_out = [s for s in need if not is_logged_in(s)]
+        for s in logged_out:
+            s.log("⚠️ Still not on the Yardi menu after login; its rows will likely fail")
+    elif not need:
+        print(f"🔑 {len(sessions)} session(s) already logged in, no manual login needed")
+    _save_logins(sessions, logged_out)
+
+
+def _save_logins(sessions: List[Session], logged_out: List[Session] = ()):
+    """Store each session's current cookies in its slot (skipping `logged_out`)."""
+    for s in sessions:
+        if s.slot and s not in logged_out:
+            try:
+                s.slot.save_cookies(s.driver.get_cookies())
+            except Exception:
+                pass   # a browser that is gone has no cookies to save
+
+
+class SessionPool:
+    """
+    Browser sessions kept open between run_jobs() calls in one process, so a second
+    family or run borrows already logged-in windows instead of starting cold. Every
+    session is checked (browser alive, still logged in) before it is handed out.
+    The remaining sessions are closed when the process exits.
+    """
+
+    def __init__(self):
+        self._idle: List[Session] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, workers: int, wait_timeout: int = 20) -> List[Session]:
+        with self._lock:
+            reused, self._idle = self._idle[:workers], self._idle[workers:]
+        sessions = [s for s in reused if _reset_session(s, workers, wait_timeout)]
+        if reused:
+            print(f"♻️ Reusing {len(sessions)} open browser session(s)")
+        taken = {s.worker_id for s in sessions}
+        free_ids = (n for n in range(1, workers * 2 + len(reused) + 1) if n not in taken)
+        try:
+            while len(sessions) < workers:
+                sessions.append(open_session(next(free_ids), workers, wait_timeout))
+            sessions.sort(key=lambda s: s.worker_id)
+            with telemetry.span("login", sessions=len(sessions)):
+                login_sessions(sessions)
+        except BaseException:
+            for s in sessions:
+                s.close()
+            raise
+        return sessions
+
+    def release(self, sessions: List[Session]):
+        with self._lock:
+            self._idle.extend(sessions)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for s in idle:
+            s.close()
+
+
+def _reset_session(session: Session, workers: int, wait_timeout: int) -> bool:
+    """Ready a pooled session for a new run; closes it and returns False if its browser is gone."""
+    try:
+        driver = session.driver
+        handles = driver.window_handles
+        for h in handles[1:]:
+            driver.switch_to.window(h)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.switch_to.default_content()
+    except WebDriverException:
+        session.close()
+        return False
+    session.page = None
+    session.main_window = None
+    session.wait = WebDriverWait(session.driver, wait_timeout)
+    session.wait_timeout = wait_timeout
+    session.tag = f"[w{session.worker_id}] " if workers > 1 else ""
+    session.downloads.clear_folder()
+    return True
+
+
+POOL = SessionPool()
+atexit.register(POOL.close)
+
+
+def switch_to_last_iframe(driver):
+    """Make sure we’re inside the latest report iframe (the page often replaces it)."""
+    driver.switch_to.default_content()
+    frames = driver.find_elements(By.TAG_NAME, "iframe")
+    if not frames:
+        raise RuntimeError("No iframe found on page.")
+    driver.switch_to.frame(frames[-1])
+
+
+# One pooled HTTP client shared by all sessions (keep-alive connections to the Yardi host)
+http = urllib3.PoolManager(num_pools=4, maxsize=8, retries=urllib3.Retry(total=2, backoff_factor=0.5))
+
+
+def browser_headers(session: Session) -> Dict[str, str]:
+    """Cookie/User-Agent headers that let a plain HTTP request act as the logged-in browser."""
+    driver = session.driver
+    return {
+        "Cookie": "; ".join(f"{c['name']}={c['value']}" for c in driver.get_cookies()),
+        "User-Agent": driver.execute_script("return navigator.userAgent;"),
+        "Referer": driver.current_url,
+    }
+
+
+def fetch_url(url: str, headers: Dict[str, str], timeout: float = 120) -> bytes:
+    """
+    GET `url` through the shared pool (safe to call from several threads at once).
+    Raises RuntimeError if the server answers with anything but a file (e.g. the login page).
+    """
+    resp = http.request("GET", url, headers=headers, timeout=urllib3.Timeout(connect=10, read=timeout))
+    if resp.status != 200:
+        raise RuntimeError(f"HTTP {resp.status} for {url}")
+    if "text/html" in resp.headers.get("Content-Type", "").lower():
+        raise RuntimeError(f"Got an HTML page instead of a report (session expired?): {url}")
+    return resp.data
+
+
+Job = Tuple[Hashable, object]
+
+
+def ensure_page(session: Session, page, navigate: Callable):
+    """Navigate only when the session isn't already on `page` (one menu walk per page, not per row)."""
+    if session.page == page:
+        return
+    session.page = None
+    with telemetry.span("navigate", page=page):
+        navigate(session, page)
+    session.page = page
+
+
+def _set_result(results: Dict[Hashable, dict], key, result: dict, on_result: Optional[Callable]):
+    results[key] = result
+    if on_result:
+        on_result(key, result)
+
+
+def _result(session: Session, queue: JobQueue, key, output,
+            error: Tuple[Optional[str], Optional[str]] = (None, None)) -> dict:
+    attempts, seconds = queue.totals(key)
+    return {"status": "ok" if output else "failed", "worker": session.worker_id, "output": output,
+            "seconds": seconds, "attempts": attempts, "error_class": error[0], "error": error[1]}
+
+
+def _settle(session: Session, queue: JobQueue, key, job, output, seconds: float, error: Tuple[str, str],
+            results: Dict[Hashable, dict], describe: Callable, on_result: Optional[Callable]):
+    """
+    Record one attempt's outcome: done, back in the queue with backoff, or failed for good.
+    `error` is (error class, message) of a failed attempt.
+    """
+    if output:
+        queue.done(key, seconds)
+        _set_result(results, key, _result(session, queue, key, output), on_result)
+        return
+    delay = queue.retry_or_fail(key, seconds, f"{error[0]}: {error[1]}", BACKOFF_FACTOR.get(error[0], 1.0))
+    if delay is not None:
+        session.log(f"🔁 Will retry {describe(job)} in {delay:.0f}s, later in the run ({error[0]})")
+        return
+    session.log(f"❌ All attempts failed for: {describe(job)}")
+    _set_result(results, key, _result(session, queue, key, None, error), on_result)
+
+
+def recycle_session(session: Session, reason: str) -> bool:
+    """
+    Replace the session's browser with a fresh one between two rows (same worker, slot and
+    download folder), logged in again with its cookies; the next row navigates as usual.
+    Returns False if no new browser could be started.
+    """
+    session.log(f"♻️ Restarting the browser: {reason}")
+    _save_logins([session])   # the freshest cookies of this server session
+    try:
+        session.driver.quit()
+    except Exception:
+        pass
+    try:
+        session.driver = make_driver(session.downloads.folder)
+    except Exception as e:
+        session.log(f"❌ Could not start a new browser: {e}")
+        return False
+    session.wait = WebDriverWait(session.driver, session.wait_timeout)
+    session.page = None
+    session.main_window = None
+    session.downloads.clear_folder()
+    session.health.restarted()
+
+    if not _login_again(session, "The browser was restarted"):
+        session.log("⚠️ Not logged in after the restart; its rows will likely fail")
+    return True
+
+
+def _login_again(session: Session, why: str) -> bool:
+    """Back onto the logged-in menu: saved cookies first, else one manual login prompt. True if logged in."""
+    if not is_logged_in(session, timeout=session.wait_timeout) and not restore_login(session):
+        if MANUAL_LOGIN:
+            with _login_lock:
+                input(f"🔐 {session.tag}{why}: please log in again in its window "
+                      f"and press ENTER here to continue...")
+        if not is_logged_in(session):
+            return False
+    _save_logins([session])
+    return True
+
+
+def relogin_session(session: Session) -> bool:
+    """The Yardi session expired mid-run: log in again; the row then navigates from the menu."""
+    session.log("🔒 The Yardi session expired; logging in again")
+    session.page = None
+    if _login_again(session, "The Yardi session expired"):
+        return True
+    session.log("⚠️ Still not logged in; its rows will likely fail")
+    return False
+
+
+PAGE_STATE_JS = """
+return [document.title + '\\n' + (document.body ? document.body.innerText.slice(0, 3000) : ''),
+        !!document.querySelector("input[type='password']")];
+"""
+
+
+def _page_state(driver) -> Tuple[str, bool]:
+    """
+    (title and start of the visible text, whether a login form is showing) of the current
+    frame and the top document, without loading anything.
+    """
+    texts, login_form = [], False
+    for top in (False, True):
+        if top:
+            driver.switch_to.default_content()
+        text, password = driver.execute_script(PAGE_STATE_JS) or ("", False)
+        texts.append(text or "")
+        login_form = login_form or bool(password)
+    return "\n".join(texts), login_form
+
+
+def _error_text(exc: Optional[BaseException], default: str) -> str:
+    if exc is None:
+        return default
+    first = str(exc).strip().splitlines()[0] if str(exc).strip() else ""
+    return f"{type(exc).__name__}: {first}" if first else type(exc).__name__
+
+
+def diagnose(session: Session, exc: Optional[BaseException]) -> str:
+    """
+    The error_classes kind of a failed attempt (`exc` None: the flow saved no file). A stale
+    frame or dead browser is taken from the exception alone. Otherwise the page is checked
+    for a server error or a login form, which costs no page load. Only when the exception
+    tells nothing (no file, unknown error) is the menu reloaded to see if the login still
+    holds. Either way the session is left for a fresh navigation (page None).
+    """
+    kind = classify_exception(exc) if exc is not None else None
+    session.page = None
+    if kind in (BROWSER_GONE, STALE_FRAME):
+        return kind
+    try:
+        text, login_form = _page_state(session.driver)
+        if is_server_error_page(text):
+            return SERVER_ERROR
+        if login_form:
+            return SESSION_EXPIRED
+        if kind is None and not is_logged_in(session, timeout=session.wait_timeout):
+            return SESSION_EXPIRED
+    except Exception as e:
+        if classify_exception(e) == BROWSER_GONE:
+            return BROWSER_GONE
+    if kind:
+        return kind
+    return DOWNLOAD_MISSING if exc is None else type(exc).__name__
+
+
+def _recover(session: Session, kind: str) -> bool:
+    """Fix a session-level failure (SESSION_KINDS) in place; True if the session is usable again."""
+    with telemetry.span("recover", worker=session.worker_id, kind=kind) as sp:
+        if kind == SESSION_EXPIRED:
+            ok = relogin_session(session)
+        else:
+            ok = recycle_session(session, "the browser stopped responding")
+        if not ok:
+            sp["outcome"] = "failed"
+    return ok
+
+
+def _attempt(session: Session, queue: JobQueue, key, job, attempt: int, results: Dict[Hashable, dict],
+             navigate: Callable, process_row: Callable, describe: Callable, page,
+             on_result: Optional[Callable] = None) -> bool:
+    """
+    One attempt at one job; True if it produced its output. A failure is classified (see
+    diagnose); an expired login or a dead browser is recovered once and the row continues
+    within the same attempt, anything else is settled (retry later or failed).
+    """
+    session.log(f"\n📄 Processing: {describe(job)}")
+    session.log(f"➡️ Attempt {attempt}/{queue.max_attempts}")
+    started = time.time()
+    output, error, recovered = None, None, False
+    while True:
+        exc = None
+        try:
+            with telemetry.tags(worker=session.worker_id, attempt=attempt):
+                ensure_page(session, page, navigate)
+                output = process_row(session, job)
+        except Exception as e:
+            session.log(f"⚠️ Error during attempt {attempt}: {e}")
+            exc = e
+        if output:
+            break
+        kind = diagnose(session, exc)
+        error = (kind, _error_text(exc, "the report flow saved no file"))
+        if recovered or kind not in SESSION_KINDS or not _recover(session, kind):
+            break
+        recovered = True
+        session.log(f"↪️ Recovered from {kind}; continuing: {describe(job)}")
+    seconds = time.time() - started
+    _settle(session, queue, key, job, output, seconds, error, results, describe, on_result)
+    if output:
+        session.health.observe(page, seconds)
+    return bool(output)
+
+
+def _worker_loop(session: Session, queue: JobQueue, results: Dict[Hashable, dict],
+                 navigate: Callable, process_row: Callable, describe: Callable, page_of: Callable,
+                 process_batch: Optional[Callable], batch_size, on_result: Optional[Callable] = None):
+    while True:
+        claimed = queue.claim(session.worker_id, session.page, batch_size if process_batch else 1)
+        if not claimed:
+            wait = queue.wait_time()
+            if wait is None:
+                return
+            # nothing eligible yet: only backed-off retries (or other workers' rows) are left
+            time.sleep(min(max(wait, 0.05), 1.0))
+            continue
+        page = page_of(claimed[0][1])
+
+        if process_batch and len(claimed) > 1:
+            started = time.time()
+            exc = None
+            try:
+                with telemetry.tags(worker=session.worker_id):
+                    ensure_page(session, page, navigate)
+                    outputs = process_batch(session, [(key, job) for key, job, _ in claimed])
+            except Exception as e:
+                session.log(f"⚠️ Batch failed: {e}")
+                outputs, exc = {}, e
+            if outputs is not None:
+                per_row = (time.time() - started) / len(claimed)
+                missed = [key for key, _, _ in claimed if not outputs.get(key)]
+                error = (None, None)
+                if missed:
+                    kind = diagnose(session, exc)
+                    error = (kind, _error_text(exc, "not collected from the batch"))
+                    if kind in SESSION_KINDS and _recover(session, kind):
+                        # the session failed, not the rows: they keep their attempt
+                        queue.give_back(missed, per_row)
+                        session.log(f"↩️ {len(missed)} row(s) back in the queue after recovering from {kind}")
+                        claimed = [c for c in claimed if c[0] not in missed]
+                    else:
+                        session.log(f"↩️ {len(missed)} row(s) not collected from the batch ({kind})")
+                for key, job, _ in claimed:
+                    _settle(session, queue, key, job, outputs.get(key), per_row, error, results, describe, on_result)
+                    if outputs.get(key):
+                        session.health.observe(page, per_row)
+                claimed = []
+
+        for key, job, attempt in claimed:
+            _attempt(session, queue, key, job, attempt, results, navigate, process_row, describe, page, on_result)
+
+        # every claimed row is settled, so a restart here loses nothing
+        reason = session.health.check(session.driver)
+        if reason:
+            with telemetry.span("recycle", worker=session.worker_id, reason=reason) as sp:
+                recycled = recycle_session(session, reason)
+                if not recycled:
+                    sp["outcome"] = "failed"
+            if not recycled:
+                return
+
+
+def run_jobs(jobs: List[Job], navigate: Callable, process_row: Callable, describe: Callable = str,
+             page_of: Callable = lambda job: None, workers: int = 1, wait_timeout: int = 20,
+             process_batch: Optional[Callable] = None, batch_size: Union[int, Callable] = 1,
+             on_result: Optional[Callable] = None, priority_of: Optional[Callable] = None) -> Dict[Hashable, dict]:
+    """
+    Run every (key, job) across `workers` logged-in browser sessions (borrowed from POOL).
+
+    • navigate(session, page): walks the menu to the report form of `page`
+    • page_of(job): the page a job needs; a session prefers jobs on the page it is
+      already on, so it navigates once per page instead of once per row
+    • process_row(session, job): one attempt; returns the saved output (truthy) or None/raises
+    • process_batch(session, [(key, job), ...]) -> {key: output}: optional pipelined path for up to
+      `batch_size` same-page jobs (an int, or page -> int so only batchable pages are claimed
+      in batches); keys it doesn't return count as a failed attempt, and returning None
+      means "not batchable" (all go to process_row)
+    • on_result(key, result): called from the worker thread as soon as a job's result is known
+    • priority_of(job): optional int, higher runs first (default: queue order)
+    Jobs live in a persistent queue (job_queue.py) that every session pulls from, so faster
+    sessions take more rows; a failed attempt is retried later in the run (exponential
+    backoff, up to job_queue.ATTEMPTS attempts) instead of blocking its session.
+    Returns {key: {"status", "worker", "output", "seconds", "attempts", "error_class", "error"}}
+    for every job (seconds summed over attempts; error_class/error describe the last failed attempt,
+    classified as in error_classes.py: an expired login or dead browser is recovered without using an attempt).
+    """
+    workers = max(1, min(workers, len(jobs))) if jobs else 1
+    started = time.time()
+    sessions = POOL.acquire(workers, wait_timeout)
+    results: Dict[Hashable, dict] = {}
+    job_queue = None
+    try:
+        job_queue = JobQueue(jobs, page_of, priority_of)
+        threads = [
+            threading.Thread(target=_worker_loop,
+                             args=(s, job_queue, results, navigate, process_row, describe, page_of,
+                                   process_batch, batch_size, on_result),
+                             name=f"yardi-w{s.worker_id}", daemon=True)
+            for s in sessions
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # Jobs left behind (e.g. every worker died) count as failed
+        job_queue.abandon()
+    finally:
+        # back to the pool, still logged in, for the next run_jobs() in this process
+        POOL.release(sessions)
+        if job_queue:
+            job_queue.close()
+
+    for key, _ in jobs:
+        if key not in results:
+            _set_result(results, key, {"status": "failed", "worker": None, "output": None, "seconds": 0.0,
+                                       "attempts": 0, "error_class": "NotRun", "error": "no worker took the job"},
+                        on_result)
+
+    print_summary(results, workers, time.time() - started)
+    for s in sessions:
+        if s.health.restarts or s.health.peak_rss_mb:
+            print(f"   [w{s.worker_id}] browser restarts: {s.health.restarts}"
+                  + (f", peak memory {s.health.peak_rss_mb:.0f} MB" if s.health.peak_rss_mb else ""))
+    return results
+
+
+def print_summary(results: Dict[Hashable, dict], workers: int, elapsed: float):
+    ok = sum(1 for r in results.values() if r["status"] == "ok")
+    failed = len(results) - ok
+    rate = (len(results) / elapsed * 60) if elapsed > 0 else 0.0
+    print(f"\n📊 Summary: {ok} saved, {failed} failed | {workers} worker(s) | "
+          f"{elapsed:.0f}s total, {rate:.1f} rows/min")
+    for w in sorted({r["worker"] for r in results.values() if r["worker"] is not None}):
+        done = [r for r in results.values() if r["worker"] == w]
+        print(f"   [w{w}] {len(done)} rows, {sum(r['seconds'] for r in done):.0f}s busy")